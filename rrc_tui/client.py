@@ -5,12 +5,19 @@ import hashlib
 import logging
 import threading
 import time
+from collections import OrderedDict
 from collections.abc import Callable
 from dataclasses import dataclass
+from functools import partial
 from typing import Any
 
 import RNS
 
+try:
+    from fastrlock.rlock import RLock as _RLock
+except ImportError:
+    _RLock = threading.RLock
+
 from .codec import decode, encode
 from .constants import (
     B_HELLO_CAPS,
@@ -57,6 +64,10 @@ from .envelope import make_envelope, validate_envelope
 
 logger = logging.getLogger(__name__)
 
+_RESOURCE_READ_CHUNK_BYTES = 65536
+
+_SIZE_ATTR_CACHE: dict[type, str] = {}
+
 
 class MessageTooLargeError(RuntimeError):
     """Raised when message exceeds link MDU."""
@@ -64,7 +75,47 @@ class MessageTooLargeError(RuntimeError):
     pass
 
 
-@dataclass
+def _utf8_fits(s: str, cap: int) -> bool:
+    """Check whether the UTF-8 encoding of s is at most cap bytes.
+
+    A UTF-8 character is between 1 and 4 bytes (exactly 1 for ASCII), so
+    most strings can be accepted or rejected from len(s) alone without
+    encoding them.
+    """
+    n = len(s)
+    if n > cap:
+        return False
+    if n * 4 <= cap or s.isascii():
+        return True
+    return len(s.encode("utf-8")) <= cap
+
+
+def _resolve_size_attr(resource: object) -> str | None:
+    """Find which size accessor a resource provides, cached per resource class."""
+    cls = type(resource)
+    attr = _SIZE_ATTR_CACHE.get(cls)
+    if attr is None:
+        for candidate in ("get_data_size", "total_size", "size"):
+            if hasattr(resource, candidate):
+                attr = _SIZE_ATTR_CACHE[cls] = candidate
+                break
+    return attr
+
+
+def _resource_size(resource: object) -> int | None:
+    """Get the data size of a resource, or None if it exposes no size."""
+    attr = _resolve_size_attr(resource)
+    if attr is None:
+        return None
+    size: int | None
+    if attr == "get_data_size":
+        size = resource.get_data_size()  # type: ignore[attr-defined]
+    else:
+        size = getattr(resource, attr)
+    return size
+
+
+@dataclass(slots=True)
 class _ResourceExpectation:
     """Tracks an expected incoming Resource transfer."""
 
@@ -78,7 +129,32 @@ class _ResourceExpectation:
     room: str | None = None
 
 
-@dataclass(frozen=True)
+class _PathWaiter:
+    """Announce handler that signals when a specific destination announces."""
+
+    receive_path_responses = True
+
+    def __init__(self, aspect_filter: str, dest_hash: bytes) -> None:
+        self.aspect_filter = aspect_filter
+        self.dest_hash = dest_hash
+        self._announced = threading.Event()
+
+    def received_announce(
+        self,
+        destination_hash: bytes,
+        announced_identity: RNS.Identity,
+        app_data: bytes,
+    ) -> None:
+        if destination_hash == self.dest_hash:
+            self._announced.set()
+
+    def wait(self, timeout: float) -> None:
+        """Sleep up to timeout seconds, returning early if an announce arrived."""
+        if self._announced.wait(timeout=timeout):
+            self._announced.clear()
+
+
+@dataclass(frozen=True, slots=True)
 class ClientConfig:
     dest_name: str = "rrc.hub"
     max_resource_bytes: int = 262144
@@ -100,6 +176,13 @@ class Client:
         nickname: str | None = None,
     ) -> None:
         self.identity = identity
+        self._identity_hash: bytes = identity.hash
+        # Encoded size of a MSG envelope with an empty room and body and no
+        # nickname. Room, body and nickname only ever add to this, so it
+        # gives msg() a lower bound to reject against without encoding.
+        self._msg_envelope_overhead = len(
+            encode(make_envelope(T_MSG, src=self._identity_hash, room="", body=""))
+        )
         self.config = config or ClientConfig()
 
         self.hello_body: dict[int, Any] = dict(hello_body or {})
@@ -108,6 +191,7 @@ class Client:
         self.hello_body.setdefault(B_HELLO_CAPS, {CAP_RESOURCE_ENVELOPE: True})
 
         self.link: RNS.Link | None = None
+        self._link_mdu: int | None = None
         self.rooms: set[str] = set()
 
         self.max_nick_bytes = DEFAULT_MAX_NICK_BYTES
@@ -116,10 +200,13 @@ class Client:
         self.max_rooms_per_session = DEFAULT_MAX_ROOMS_PER_SESSION
         self.rate_limit_msgs_per_minute = DEFAULT_RATE_LIMIT_MSGS_PER_MINUTE
 
-        self._lock = threading.RLock()
+        self._lock = _RLock()
         self._welcomed = threading.Event()
 
-        self._resource_expectations: dict[bytes, _ResourceExpectation] = {}
+        self._resource_expectations: OrderedDict[bytes, _ResourceExpectation] = (
+            OrderedDict()
+        )
+        self._expectations_by_size: dict[int, list[bytes]] = {}
         self._active_resources: set[RNS.Resource] = set()
         self._resource_to_expectation: dict[RNS.Resource, _ResourceExpectation] = {}
 
@@ -132,13 +219,31 @@ class Client:
         self.on_close: Callable[[], None] | None = None
         self.on_resource_warning: Callable[[str], None] | None = None
         self.on_pong: Callable[[dict], None] | None = None
+        self.on_link_status: Callable[[bool], None] | None = None
 
         self._ping_thread: threading.Thread | None = None
         self._ping_stop = threading.Event()
         self._last_ping_time: float | None = None
         self.latency_ms: float | None = None
 
+        self._dispatch: dict[int, Callable[[dict], None]] = {
+            T_PING: self._handle_ping,
+            T_PONG: self._handle_pong,
+            T_RESOURCE_ENVELOPE: self._handle_resource_envelope,
+            T_WELCOME: self._handle_welcome,
+            T_JOINED: self._handle_joined,
+            T_PARTED: self._handle_parted,
+            T_MSG: partial(self._forward, "on_message"),
+            T_NOTICE: partial(self._forward, "on_notice"),
+            T_ERROR: partial(self._forward, "on_error"),
+        }
+
+        # Raw room argument -> stripped, lowercased form, so repeated msg()
+        # calls to the same room skip the normalization work.
+        self._room_canonical: OrderedDict[str, str] = OrderedDict()
+
         self._nickname: str | None = None
+        self._nick_bytes_len = 0
         if nickname:
             self.set_nickname(nickname)
 
@@ -146,6 +251,7 @@ class Client:
         """Set the nickname with validation against hub limits."""
         if nickname is None:
             self._nickname = None
+            self._nick_bytes_len = 0
             return
 
         if not isinstance(nickname, str):
@@ -160,6 +266,7 @@ class Client:
             )
 
         self._nickname = nickname
+        self._nick_bytes_len = nick_bytes
 
     @property
     def nickname(self) -> str | None:
@@ -180,30 +287,42 @@ class Client:
     ) -> None:
         self._welcomed.clear()
 
-        RNS.Transport.request_path(hub_dest_hash)
-
+        # Polling stays as a backstop, but the hub's announce (or path
+        # response) wakes the wait loops as soon as it is processed.
+        path_waiter = _PathWaiter(self.config.dest_name, hub_dest_hash)
+        RNS.Transport.register_announce_handler(path_waiter)
         try:
-            path_wait_deadline = time.monotonic() + min(5.0, float(timeout_s))
+            RNS.Transport.request_path(hub_dest_hash)
+
+            try:
+                path_wait_deadline = time.monotonic() + min(5.0, float(timeout_s))
+                sleep_interval = 0.05
+                max_sleep = 0.5
+                while not RNS.Transport.has_path(hub_dest_hash):
+                    now = time.monotonic()
+                    if now >= path_wait_deadline:
+                        break
+                    path_waiter.wait(min(sleep_interval, path_wait_deadline - now))
+                    sleep_interval = min(sleep_interval * 1.5, max_sleep)
+            except Exception as e:
+                logger.warning("Error during path wait: %s", e)
+
+            recall_deadline = time.monotonic() + float(timeout_s)
+            hub_identity: RNS.Identity | None = None
             sleep_interval = 0.05
             max_sleep = 0.5
-            while time.monotonic() < path_wait_deadline:
-                if RNS.Transport.has_path(hub_dest_hash):
+            while True:
+                hub_identity = RNS.Identity.recall(hub_dest_hash)
+                if hub_identity is not None:
+                    break
+                now = time.monotonic()
+                if now >= recall_deadline:
                     break
-                time.sleep(sleep_interval)
+                path_waiter.wait(min(sleep_interval, recall_deadline - now))
                 sleep_interval = min(sleep_interval * 1.5, max_sleep)
-        except Exception as e:
-            logger.warning("Error during path wait: %s", e)
-
-        recall_deadline = time.monotonic() + float(timeout_s)
-        hub_identity: RNS.Identity | None = None
-        sleep_interval = 0.05
-        max_sleep = 0.5
-        while time.monotonic() < recall_deadline:
-            hub_identity = RNS.Identity.recall(hub_dest_hash)
-            if hub_identity is not None:
-                break
-            time.sleep(sleep_interval)
-            sleep_interval = min(sleep_interval * 1.5, max_sleep)
+        finally:
+            with contextlib.suppress(Exception):
+                RNS.Transport.deregister_announce_handler(path_waiter)
 
         if hub_identity is None:
             raise TimeoutError(
@@ -234,7 +353,7 @@ class Client:
 
         def _send_hello(link: RNS.Link) -> None:
             envelope = make_envelope(
-                T_HELLO, src=self.identity.hash, body=self.hello_body
+                T_HELLO, src=self._identity_hash, body=self.hello_body
             )
             if self.nickname:
                 envelope[K_NICK] = self.nickname
@@ -248,12 +367,15 @@ class Client:
             next_send = time.monotonic()
             attempts = 0
 
-            while time.monotonic() < deadline and not self._welcomed.is_set():
+            while not self._welcomed.is_set():
+                now = time.monotonic()
+                if now >= deadline:
+                    return
+
                 with self._lock:
                     if self.link is not link:
                         return
 
-                now = time.monotonic()
                 if attempts < max_attempts and now >= next_send:
                     try:
                         _send_hello(link)
@@ -267,7 +389,10 @@ class Client:
                     attempts += 1
                     next_send = now + hello_interval_s
 
-                time.sleep(0.1)
+                wake_at = next_send if attempts < max_attempts else deadline
+                wait_s = max(0.0, min(wake_at, deadline) - now)
+                if self._welcomed.wait(timeout=wait_s):
+                    return
 
         def _established(established_link: RNS.Link) -> None:
             logger.debug("Link established - setting resource callbacks")
@@ -276,6 +401,11 @@ class Client:
             established_link.set_resource_started_callback(self._resource_advertised)
             established_link.set_resource_concluded_callback(self._resource_concluded)
 
+            link_mdu = getattr(established_link, "mdu", None)
+            with self._lock:
+                if self.link is established_link:
+                    self._link_mdu = link_mdu if isinstance(link_mdu, int) else None
+
             try:
                 established_link.identify(self.identity)
             except Exception as e:
@@ -284,6 +414,8 @@ class Client:
                     established_link.teardown()
                 return
 
+            self._notify_link_status(True)
+
             deadline = time.monotonic() + float(timeout_s)
             t = threading.Thread(
                 target=_hello_loop,
@@ -296,29 +428,18 @@ class Client:
         def _closed(_: RNS.Link) -> None:
             with self._lock:
                 self.link = None
+                self._link_mdu = None
                 self.rooms.clear()
                 active_resources = list(self._active_resources)
                 self._resource_expectations.clear()
+                self._expectations_by_size.clear()
                 self._active_resources.clear()
                 self._resource_to_expectation.clear()
 
-                for resource in active_resources:
-                    try:
-                        if hasattr(resource, "cancel") and callable(resource.cancel):
-                            resource.cancel()
-                    except Exception as e:
-                        logger.debug(
-                            "Error canceling resource in link closed callback: %s", e
-                        )
-                    finally:
-                        try:
-                            if hasattr(resource, "data") and resource.data:
-                                resource.data.close()
-                        except Exception as e:
-                            logger.debug(
-                                "Error closing resource data in link closed callback: %s",
-                                e,
-                            )
+            for resource in active_resources:
+                self._shutdown_resource(resource)
+
+            self._notify_link_status(False)
 
             if self.on_close:
                 try:
@@ -327,26 +448,27 @@ class Client:
                     logger.exception("Error in on_close callback: %s", e)
 
         if self.config.cleanup_existing_links:
-            found_existing = False
+            # Identify stale links first, then tear them down in a separate
+            # pass so no blocking teardown happens while scanning.
+            stale_links = []
+            for existing_link in list(getattr(RNS.Transport, "active_links", ())):
+                try:
+                    destination = existing_link.destination
+                    if destination and destination.hash == hub_dest_hash:
+                        stale_links.append(existing_link)
+                except Exception as e:
+                    logger.warning("Error checking existing link: %s", e)
 
-            if hasattr(RNS.Transport, "active_links") and RNS.Transport.active_links:
-                for existing_link in list(RNS.Transport.active_links):
+            if stale_links:
+                logger.info(
+                    "Tearing down %d existing active link(s) to same hub",
+                    len(stale_links),
+                )
+                for existing_link in stale_links:
                     try:
-                        dest_hash = (
-                            existing_link.destination.hash
-                            if existing_link.destination
-                            else None
-                        )
-                        if dest_hash == hub_dest_hash:
-                            logger.info("Tearing down existing active link to same hub")
-                            existing_link.teardown()
-                            found_existing = True
+                        existing_link.teardown()
                     except Exception as e:
-                        logger.warning(
-                            "Error checking/tearing down existing link: %s", e
-                        )
-
-            if found_existing:
+                        logger.warning("Error tearing down existing link: %s", e)
                 time.sleep(1.0)
 
         link = RNS.Link(
@@ -356,6 +478,7 @@ class Client:
 
         with self._lock:
             self.link = link
+            self._link_mdu = None
 
         if wait_for_welcome:
             logger.debug("Waiting for WELCOME (timeout=%ss)...", timeout_s)
@@ -373,26 +496,17 @@ class Client:
         with self._lock:
             link = self.link
             self.link = None
+            self._link_mdu = None
             self.rooms.clear()
             self._resource_expectations.clear()
+            self._expectations_by_size.clear()
 
             active_resources = list(self._active_resources)
             self._active_resources.clear()
             self._resource_to_expectation.clear()
 
         for resource in active_resources:
-            try:
-                if hasattr(resource, "cancel") and callable(resource.cancel):
-                    resource.cancel()
-                if hasattr(resource, "data") and resource.data:
-                    try:
-                        resource.data.close()
-                    except Exception as e:
-                        logger.debug(
-                            "Error closing resource data during cleanup: %s", e
-                        )
-            except Exception as e:
-                logger.debug("Error canceling resource during cleanup: %s", e)
+            self._shutdown_resource(resource)
 
         if link is not None:
             try:
@@ -435,15 +549,34 @@ class Client:
         self._last_ping_time = None
         self.latency_ms = None
 
+    def _notify_link_status(self, active: bool) -> None:
+        if self.on_link_status:
+            try:
+                self.on_link_status(active)
+            except Exception as e:
+                logger.exception("Error in on_link_status callback: %s", e)
+
+    def _canonical_room(self, room: str) -> str:
+        """Return the stripped, lowercased room name, memoized per raw name."""
+        r = self._room_canonical.get(room)
+        if r is None:
+            r = room.strip().lower()
+            with self._lock:
+                cache = self._room_canonical
+                cache[room] = r
+                while len(cache) > max(1, self.max_rooms_per_session):
+                    cache.popitem(last=False)
+        return r
+
     def join(self, room: str, *, key: str | None = None) -> None:
         if not isinstance(room, str):
             raise ValueError(f"Room name must be a string (got {type(room).__name__})")
-        r = room.strip().lower()
+        r = self._canonical_room(room)
         if not r:
             raise ValueError("Room name cannot be empty.")
 
-        room_bytes = len(r.encode("utf-8"))
-        if room_bytes > self.max_room_name_bytes:
+        if not _utf8_fits(r, self.max_room_name_bytes):
+            room_bytes = len(r.encode("utf-8"))
             raise ValueError(
                 f"Room name too long: {room_bytes} bytes exceeds hub limit of {self.max_room_name_bytes} bytes"
             )
@@ -455,15 +588,15 @@ class Client:
                 )
 
         body: Any = key if (isinstance(key, str) and key) else None
-        self._send(make_envelope(T_JOIN, src=self.identity.hash, room=r, body=body))
+        self._send(make_envelope(T_JOIN, src=self._identity_hash, room=r, body=body))
 
     def part(self, room: str) -> None:
         if not isinstance(room, str):
             raise ValueError(f"Room name must be a string (got {type(room).__name__})")
-        r = room.strip().lower()
+        r = self._canonical_room(room)
         if not r:
             raise ValueError("Room name cannot be empty.")
-        self._send(make_envelope(T_PART, src=self.identity.hash, room=r))
+        self._send(make_envelope(T_PART, src=self._identity_hash, room=r))
         with self._lock:
             self.rooms.discard(r)
 
@@ -474,22 +607,37 @@ class Client:
             raise ValueError(
                 f"Message text must be a string (got {type(text).__name__})"
             )
-        r = room.strip().lower()
+        r = self._canonical_room(room)
         if not r:
             raise ValueError("Room name cannot be empty.")
         if not text.strip():
             raise ValueError("Message text cannot be empty.")
 
-        msg_bytes = len(text.encode("utf-8"))
-        if msg_bytes > self.max_msg_body_bytes:
+        if not _utf8_fits(text, self.max_msg_body_bytes):
+            msg_bytes = len(text.encode("utf-8"))
             raise ValueError(
                 f"Message too long: {msg_bytes} bytes exceeds hub limit of {self.max_msg_body_bytes} bytes"
             )
 
-        env = make_envelope(T_MSG, src=self.identity.hash, room=r, body=text)
+        # One acquire covers both the size pre-check and the send.
+        with self._lock:
+            link = self.link
+            link_mdu = self._link_mdu
+        if link is None:
+            raise RuntimeError("Not connected to hub.")
+        if link_mdu is not None:
+            # Characters never outnumber UTF-8 bytes, and a nickname costs at
+            # least its key and string header on top of its bytes.
+            min_size = self._msg_envelope_overhead + len(r) + len(text)
+            if self._nickname:
+                min_size += self._nick_bytes_len + 2
+            if min_size > link_mdu:
+                self._reject_oversized()
+
+        env = make_envelope(T_MSG, src=self._identity_hash, room=r, body=text)
         if self.nickname:
             env[K_NICK] = self.nickname
-        self._send(env)
+        self._send_on(link, link_mdu, env)
         mid = env.get(K_ID)
         if not isinstance(mid, (bytes, bytearray)):
             raise TypeError("message id (K_ID) must be bytes")
@@ -498,7 +646,7 @@ class Client:
     def ping(self) -> None:
         """Send a PING to the server."""
         self._last_ping_time = time.monotonic()
-        self._send(make_envelope(T_PING, src=self.identity.hash))
+        self._send(make_envelope(T_PING, src=self._identity_hash))
 
     def _packet_would_fit(self, link: RNS.Link, payload: bytes) -> bool:
         """Check if packet would fit within link MDU."""
@@ -509,38 +657,70 @@ class Client:
         except Exception:
             return False
 
-    def _cleanup_expired_expectations(self) -> None:
-        """Remove expired resource expectations."""
-        now = time.monotonic()
-        with self._lock:
-            expired = [
-                rid
-                for rid, exp in self._resource_expectations.items()
-                if now >= exp.expires_at
-            ]
-            for rid in expired:
-                del self._resource_expectations[rid]
+    def _cleanup_expired_expectations(self, now: float) -> None:
+        """Remove expired resource expectations. Caller must hold the lock."""
+        # Expectations share one TTL and are kept in insertion order, so
+        # they expire oldest-first and the sweep can stop at the first
+        # live entry.
+        expectations = self._resource_expectations
+        while expectations:
+            rid, exp = next(iter(expectations.items()))
+            if now < exp.expires_at:
+                break
+            self._drop_expectation(rid)
+
+    def _store_expectation(self, exp: _ResourceExpectation) -> None:
+        """Add an expectation and index it by size. Caller must hold the lock."""
+        self._drop_expectation(exp.id)
+        if (
+            len(self._resource_expectations)
+            >= self.config.max_pending_resource_expectations
+        ):
+            self._drop_expectation(next(iter(self._resource_expectations)))
+        self._resource_expectations[exp.id] = exp
+        self._expectations_by_size.setdefault(exp.size, []).append(exp.id)
+
+    def _drop_expectation(self, rid: bytes) -> _ResourceExpectation | None:
+        """Remove an expectation and its size index entry. Caller must hold the lock."""
+        exp = self._resource_expectations.pop(rid, None)
+        if exp is not None:
+            rids = self._expectations_by_size[exp.size]
+            rids.remove(rid)
+            if not rids:
+                del self._expectations_by_size[exp.size]
+        return exp
+
+    def _shutdown_resource(
+        self, resource: RNS.Resource, *, cancel: bool = True
+    ) -> None:
+        """Optionally cancel a resource transfer, then close its data handle."""
+        if cancel:
+            try:
+                cancel_transfer = getattr(resource, "cancel", None)
+                if callable(cancel_transfer):
+                    cancel_transfer()
+            except Exception as e:
+                logger.debug("Error canceling resource: %s", e)
+        try:
+            if resource_data := getattr(resource, "data", None):
+                resource_data.close()
+        except Exception as e:
+            logger.debug("Error closing resource data: %s", e)
 
     def _find_resource_expectation(self, size: int) -> _ResourceExpectation | None:
-        """Find matching resource expectation by size."""
-        self._cleanup_expired_expectations()
+        """Find matching resource expectation by size. Caller must hold the lock."""
+        self._cleanup_expired_expectations(time.monotonic())
 
-        with self._lock:
-            for _rid, exp in list(self._resource_expectations.items()):
-                if exp.size == size:
-                    return exp
-        return None
+        rids = self._expectations_by_size.get(size)
+        if not rids:
+            return None
+        return self._resource_expectations[rids[0]]
 
     def _resource_advertised(self, resource: RNS.Resource) -> bool:
         """Callback when a Resource is advertised. Returns True to accept, False to reject."""
         try:
-            if hasattr(resource, "get_data_size"):
-                size = resource.get_data_size()
-            elif hasattr(resource, "total_size"):
-                size = resource.total_size
-            elif hasattr(resource, "size"):
-                size = resource.size
-            else:
+            size = _resource_size(resource)
+            if size is None:
                 logger.error("Resource object has no size attribute")
                 return False
 
@@ -558,80 +738,78 @@ class Client:
                 logger.warning("Rejecting resource: too many active transfers")
                 return False
 
-        exp = self._find_resource_expectation(size)
+            exp = self._find_resource_expectation(size)
+            self._active_resources.add(resource)
+            if exp:
+                self._resource_to_expectation[resource] = exp
+
         if not exp:
             logger.warning("Resource advertised without matching expectation")
-            with self._lock:
-                self._active_resources.add(resource)
             logger.info(f"Accepted speculative resource transfer: size={size}")
             return True
 
-        with self._lock:
-            self._active_resources.add(resource)
-            self._resource_to_expectation[resource] = exp
-
         logger.info(f"Accepted resource transfer: kind={exp.kind}, size={size}")
         return True
 
     def _resource_concluded(self, resource: RNS.Resource) -> None:
         """Callback when a Resource transfer completes."""
         logger.debug(f"Resource concluded, status={resource.status}")
+        size = _resource_size(resource)
         with self._lock:
             self._active_resources.discard(resource)
             matched_exp = self._resource_to_expectation.pop(resource, None)
+            if not matched_exp and size is not None:
+                matched_exp = self._find_resource_expectation(size)
+            if (
+                matched_exp
+                and self._resource_expectations.get(matched_exp.id) is matched_exp
+            ):
+                self._drop_expectation(matched_exp.id)
 
         if not matched_exp:
-            size = (
-                resource.total_size
-                if hasattr(resource, "total_size")
-                else resource.size
-            )
-            matched_exp = self._find_resource_expectation(size)
-            if not matched_exp:
-                logger.warning("No expectation found for concluded resource")
-                try:
-                    if hasattr(resource, "data") and resource.data:
-                        resource.data.close()
-                except Exception as e:
-                    logger.debug("Error closing unexpected resource data: %s", e)
-                return
-
-        with self._lock:
-            for rid, exp in list(self._resource_expectations.items()):
-                if exp == matched_exp:
-                    self._resource_expectations.pop(rid, None)
-                    break
+            logger.warning("No expectation found for concluded resource")
+            self._shutdown_resource(resource, cancel=False)
+            return
 
         if resource.status != RNS.Resource.COMPLETE:
             logger.warning(f"Resource transfer incomplete: status={resource.status}")
-            try:
-                if hasattr(resource, "data") and resource.data:
-                    resource.data.close()
-            except Exception as e:
-                logger.debug("Error closing incomplete resource data: %s", e)
+            self._shutdown_resource(resource, cancel=False)
             return
 
         data = None
         try:
-            data = resource.data.read()
+            if matched_exp.sha256:
+                # Read straight into a buffer of the advertised size and hash
+                # memoryview slices of it, so no per-chunk copies are made.
+                hasher = hashlib.sha256()
+                buf = bytearray(matched_exp.size)
+                filled = 0
+                with memoryview(buf) as view:
+                    while filled < len(buf):
+                        end = min(filled + _RESOURCE_READ_CHUNK_BYTES, len(buf))
+                        n = resource.data.readinto(view[filled:end])
+                        if not n:
+                            break
+                        hasher.update(view[filled : filled + n])
+                        filled += n
+                if resource.data.read(1):
+                    logger.warning("Resource larger than advertised size")
+                    return
+                if hasher.digest() != matched_exp.sha256:
+                    logger.warning("Resource SHA256 mismatch")
+                    return
+                del buf[filled:]
+                data = buf
+            else:
+                data = resource.data.read()
         except Exception as e:
             logger.warning("Failed to read resource data: %s", e)
         finally:
-            try:
-                if hasattr(resource, "data") and resource.data:
-                    resource.data.close()
-            except Exception as e:
-                logger.debug("Error closing resource data: %s", e)
+            self._shutdown_resource(resource, cancel=False)
 
         if data is None:
             return
 
-        if matched_exp.sha256:
-            computed = hashlib.sha256(data).digest()
-            if computed != matched_exp.sha256:
-                logger.warning("Resource SHA256 mismatch")
-                return
-
         if matched_exp.kind in (RES_KIND_NOTICE, RES_KIND_MOTD):
             try:
                 encoding = matched_exp.encoding or "utf-8"
@@ -655,19 +833,33 @@ class Client:
     def _send(self, env: dict) -> None:
         with self._lock:
             link = self.link
+            link_mdu = self._link_mdu
         if link is None:
             raise RuntimeError("Not connected to hub.")
+        self._send_on(link, link_mdu, env)
+
+    def _send_on(self, link: RNS.Link, link_mdu: int | None, env: dict) -> None:
+        """Send an envelope on a link snapshot already read under _lock."""
         payload = encode(env)
 
-        if not self._packet_would_fit(link, payload):
-            if self.on_resource_warning:
-                warning = "Message is too large to send."
-                with contextlib.suppress(Exception):
-                    self.on_resource_warning(warning)
-            raise MessageTooLargeError("Message exceeds link MDU")
+        if link_mdu is not None:
+            fits = len(payload) <= link_mdu
+        else:
+            fits = self._packet_would_fit(link, payload)
+
+        if not fits:
+            self._reject_oversized()
 
         RNS.Packet(link, payload).send()
 
+    def _reject_oversized(self) -> None:
+        """Warn the UI and raise for a payload that cannot fit the link MDU."""
+        if self.on_resource_warning:
+            warning = "Message is too large to send."
+            with contextlib.suppress(Exception):
+                self.on_resource_warning(warning)
+        raise MessageTooLargeError("Message exceeds link MDU")
+
     def _on_packet(self, data: bytes) -> None:
         try:
             env = decode(data)
@@ -676,164 +868,142 @@ class Client:
             logger.debug("Failed to decode/validate packet: %s", e)
             return
 
-        t = env.get(K_T)
+        handler = self._dispatch.get(env[K_T])
+        if handler is not None:
+            handler(env)
+
+    def _handle_ping(self, env: dict) -> None:
+        body = env.get(K_BODY)
+        with contextlib.suppress(Exception):
+            self._send(make_envelope(T_PONG, src=self._identity_hash, body=body))
 
-        if t == T_PING:
-            body = env.get(K_BODY)
+    def _handle_pong(self, env: dict) -> None:
+        if self.on_pong:
             with contextlib.suppress(Exception):
-                self._send(make_envelope(T_PONG, src=self.identity.hash, body=body))
-            return
+                self.on_pong(env)
 
-        if t == T_PONG:
-            if self.on_pong:
-                with contextlib.suppress(Exception):
-                    self.on_pong(env)
+    def _handle_resource_envelope(self, env: dict) -> None:
+        body = env.get(K_BODY)
+        if not isinstance(body, dict):
             return
 
-        if t == T_RESOURCE_ENVELOPE:
-            body = env.get(K_BODY)
-            if not isinstance(body, dict):
-                return
-
+        try:
             try:
-                rid = body.get(B_RES_ID)
-                kind = body.get(B_RES_KIND)
-                size = body.get(B_RES_SIZE)
-                sha256 = body.get(B_RES_SHA256)
-                encoding = body.get(B_RES_ENCODING)
-
-                if not isinstance(rid, (bytes, bytearray)):
-                    return
-                if not isinstance(kind, str):
-                    return
-                if not isinstance(size, int) or size <= 0:
-                    return
-                if sha256 is not None and not isinstance(sha256, (bytes, bytearray)):
-                    return
-                if encoding is not None and not isinstance(encoding, str):
-                    return
-
-                if size > self.config.max_resource_bytes:
-                    return
+                rid = body[B_RES_ID]
+                kind = body[B_RES_KIND]
+                size = body[B_RES_SIZE]
+            except KeyError:
+                return
+            sha256 = body.get(B_RES_SHA256)
+            encoding = body.get(B_RES_ENCODING)
+
+            if not (
+                isinstance(rid, (bytes, bytearray))
+                and isinstance(kind, str)
+                and isinstance(size, int)
+                and 0 < size <= self.config.max_resource_bytes
+            ):
+                return
+            if sha256 is not None and not isinstance(sha256, (bytes, bytearray)):
+                return
+            if encoding is not None and not isinstance(encoding, str):
+                return
 
-                now = time.monotonic()
-                room = env.get(K_ROOM)
+            now = time.monotonic()
+            room = env.get(K_ROOM)
+            rid_bytes = bytes(rid)
+            exp = _ResourceExpectation(
+                id=rid_bytes,
+                kind=kind,
+                size=size,
+                sha256=bytes(sha256) if sha256 else None,
+                encoding=encoding,
+                created_at=now,
+                expires_at=now + self.config.resource_expectation_ttl_s,
+                room=room if isinstance(room, str) else None,
+            )
 
-                with self._lock:
-                    if (
-                        len(self._resource_expectations)
-                        >= self.config.max_pending_resource_expectations
-                    ):
-                        oldest_rid = min(
-                            self._resource_expectations.keys(),
-                            key=lambda r: self._resource_expectations[r].created_at,
-                        )
-                        del self._resource_expectations[oldest_rid]
-
-                    self._resource_expectations[bytes(rid)] = _ResourceExpectation(
-                        id=bytes(rid),
-                        kind=kind,
-                        size=size,
-                        sha256=bytes(sha256) if sha256 else None,
-                        encoding=encoding,
-                        created_at=now,
-                        expires_at=now + self.config.resource_expectation_ttl_s,
-                        room=room if isinstance(room, str) else None,
-                    )
-                    logger.debug(
-                        f"Stored resource expectation: kind={kind}, size={size}"
-                    )
-            except Exception as e:
-                logger.warning("Failed to process resource envelope: %s", e)
-            return
+            with self._lock:
+                self._store_expectation(exp)
 
-        if t == T_WELCOME:
-            logger.debug("Received T_WELCOME")
-
-            body = env.get(K_BODY)
-            if isinstance(body, dict) and B_WELCOME_LIMITS in body:
-                limits = body[B_WELCOME_LIMITS]
-                if isinstance(limits, dict):
-                    with self._lock:
-                        if L_MAX_NICK_BYTES in limits:
-                            self.max_nick_bytes = int(limits[L_MAX_NICK_BYTES])
-                        if L_MAX_ROOM_NAME_BYTES in limits:
-                            self.max_room_name_bytes = int(
-                                limits[L_MAX_ROOM_NAME_BYTES]
-                            )
-                        if L_MAX_MSG_BODY_BYTES in limits:
-                            self.max_msg_body_bytes = int(limits[L_MAX_MSG_BODY_BYTES])
-                        if L_MAX_ROOMS_PER_SESSION in limits:
-                            self.max_rooms_per_session = int(
-                                limits[L_MAX_ROOMS_PER_SESSION]
-                            )
-                        if L_RATE_LIMIT_MSGS_PER_MINUTE in limits:
-                            self.rate_limit_msgs_per_minute = int(
-                                limits[L_RATE_LIMIT_MSGS_PER_MINUTE]
-                            )
-                    logger.debug(
-                        "Hub limits: nick=%d, room=%d, msg=%d, max_rooms=%d, rate=%d/min",
-                        self.max_nick_bytes,
-                        self.max_room_name_bytes,
-                        self.max_msg_body_bytes,
-                        self.max_rooms_per_session,
+            logger.debug(f"Stored resource expectation: kind={kind}, size={size}")
+        except Exception as e:
+            logger.warning("Failed to process resource envelope: %s", e)
+
+    def _handle_welcome(self, env: dict) -> None:
+        logger.debug("Received T_WELCOME")
+
+        body = env.get(K_BODY)
+        if isinstance(body, dict) and B_WELCOME_LIMITS in body:
+            limits = body[B_WELCOME_LIMITS]
+            if isinstance(limits, dict):
+                max_nick_bytes = int(limits.get(L_MAX_NICK_BYTES, self.max_nick_bytes))
+                max_room_name_bytes = int(
+                    limits.get(L_MAX_ROOM_NAME_BYTES, self.max_room_name_bytes)
+                )
+                max_msg_body_bytes = int(
+                    limits.get(L_MAX_MSG_BODY_BYTES, self.max_msg_body_bytes)
+                )
+                max_rooms_per_session = int(
+                    limits.get(L_MAX_ROOMS_PER_SESSION, self.max_rooms_per_session)
+                )
+                rate_limit_msgs_per_minute = int(
+                    limits.get(
+                        L_RATE_LIMIT_MSGS_PER_MINUTE,
                         self.rate_limit_msgs_per_minute,
                     )
-
-            self._welcomed.set()
-            if self.on_welcome:
-                try:
-                    self.on_welcome(env)
-                except Exception as e:
-                    logger.exception("Error in on_welcome callback: %s", e)
-            return
-
-        if t == T_JOINED:
-            room = env.get(K_ROOM)
-            if isinstance(room, str) and room:
-                r = room.strip().lower()
+                )
                 with self._lock:
-                    self.rooms.add(r)
-                if self.on_joined:
-                    try:
-                        self.on_joined(r, env)
-                    except Exception as e:
-                        logger.exception("Error in on_joined callback: %s", e)
-            return
+                    self.max_nick_bytes = max_nick_bytes
+                    self.max_room_name_bytes = max_room_name_bytes
+                    self.max_msg_body_bytes = max_msg_body_bytes
+                    self.max_rooms_per_session = max_rooms_per_session
+                    self.rate_limit_msgs_per_minute = rate_limit_msgs_per_minute
+                logger.debug(
+                    "Hub limits: nick=%d, room=%d, msg=%d, max_rooms=%d, rate=%d/min",
+                    self.max_nick_bytes,
+                    self.max_room_name_bytes,
+                    self.max_msg_body_bytes,
+                    self.max_rooms_per_session,
+                    self.rate_limit_msgs_per_minute,
+                )
 
-        if t == T_PARTED:
-            room = env.get(K_ROOM)
-            if isinstance(room, str) and room:
-                r = room.strip().lower()
-                with self._lock:
-                    self.rooms.discard(r)
-                if self.on_parted:
-                    try:
-                        self.on_parted(r, env)
-                    except Exception as e:
-                        logger.exception("Error in on_parted callback: %s", e)
-            return
+        self._welcomed.set()
+        if self.on_welcome:
+            try:
+                self.on_welcome(env)
+            except Exception as e:
+                logger.exception("Error in on_welcome callback: %s", e)
 
-        if t == T_MSG:
-            if self.on_message:
+    def _handle_joined(self, env: dict) -> None:
+        room = env.get(K_ROOM)
+        if isinstance(room, str) and room:
+            r = self._canonical_room(room)
+            with self._lock:
+                self.rooms.add(r)
+            if self.on_joined:
                 try:
-                    self.on_message(env)
+                    self.on_joined(r, env)
                 except Exception as e:
-                    logger.exception("Error in on_message callback: %s", e)
-            return
+                    logger.exception("Error in on_joined callback: %s", e)
 
-        if t == T_NOTICE:
-            if self.on_notice:
+    def _handle_parted(self, env: dict) -> None:
+        room = env.get(K_ROOM)
+        if isinstance(room, str) and room:
+            r = self._canonical_room(room)
+            with self._lock:
+                self.rooms.discard(r)
+            if self.on_parted:
                 try:
-                    self.on_notice(env)
+                    self.on_parted(r, env)
                 except Exception as e:
-                    logger.exception("Error in on_notice callback: %s", e)
-            return
+                    logger.exception("Error in on_parted callback: %s", e)
 
-        if t == T_ERROR:
-            if self.on_error:
-                try:
-                    self.on_error(env)
-                except Exception as e:
-                    logger.exception("Error in on_error callback: %s", e)
-            return
+    def _forward(self, callback_name: str, env: dict) -> None:
+        """Hand an envelope straight to the named user callback, if set."""
+        callback = getattr(self, callback_name)
+        if callback:
+            try:
+                callback(env)
+            except Exception as e:
+                logger.exception("Error in %s callback: %s", callback_name, e)
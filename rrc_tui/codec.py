@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+import json
+from typing import Any
+
 import cbor2
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 
 def encode(obj) -> bytes:
     return cbor2.dumps(obj)
@@ -9,3 +17,19 @@ def encode(obj) -> bytes:
 
 def decode(b: bytes):
     return cbor2.loads(b)
+
+
+def json_loads(data: bytes) -> Any:
+    """Parse JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, *, indent: bool = True) -> bytes:
+    """Serialize to UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
-import json
+import functools
 import logging
 import os
+import time
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
+from .codec import json_dumps, json_loads
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +28,7 @@ def _expand_path(p: str) -> str:
     return os.path.expanduser(os.path.expandvars(p))
 
 
+@functools.lru_cache(maxsize=1)
 def get_config_dir() -> Path:
     """Find existing config directory or return default.
 
@@ -32,6 +37,9 @@ def get_config_dir() -> Path:
     2. ~/.config/rrc-tui
     3. ~/.rrc-tui
 
+    The result is cached for the life of the process; call
+    ``get_config_dir.cache_clear()`` to search again.
+
     Returns:
         Path to config directory (may not exist yet)
     """
@@ -51,8 +59,12 @@ def get_config_dir() -> Path:
     return default_path
 
 
+@functools.lru_cache(maxsize=1)
 def get_config_path() -> Path:
-    """Get path to TUI config file."""
+    """Get path to TUI config file.
+
+    Cached like get_config_dir(); clear both caches together.
+    """
     return get_config_dir() / "config.json"
 
 
@@ -60,8 +72,17 @@ def get_default_config() -> dict[str, Any]:
     """Get default configuration values.
 
     Returns:
-        Dictionary with default configuration
+        Dictionary with default configuration, safe for the caller to mutate
     """
+    return {
+        key: list(value) if isinstance(value, list) else value
+        for key, value in _default_config().items()
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _default_config() -> dict[str, Any]:
+    """Build the shared defaults once. Callers must not mutate the result."""
     config_dir = get_config_dir()
     default_identity_path = str(config_dir / "identity")
 
@@ -91,6 +112,81 @@ def get_default_config() -> dict[str, Any]:
     }
 
 
+def _non_negative_int(value: Any) -> int:
+    """Coerce to a non-negative int."""
+    n: int = value if type(value) is int else int(value)
+    if n < 0:
+        raise ValueError("must not be negative")
+    return n
+
+
+def _unit_float(value: Any) -> float:
+    """Coerce to a float in [0.0, 1.0]."""
+    f: float = value if type(value) is float else float(value)
+    if not (0.0 <= f <= 1.0):
+        raise ValueError("must be between 0.0 and 1.0")
+    return f
+
+
+def _strict_bool(value: Any) -> bool:
+    """Accept only real booleans."""
+    if not isinstance(value, bool):
+        raise TypeError("must be a boolean")
+    return value
+
+
+def _strict_str(value: Any) -> str:
+    """Accept only strings."""
+    if not isinstance(value, str):
+        raise TypeError("must be a string")
+    return value
+
+
+_VALID_LOG_LEVELS = frozenset({"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"})
+
+
+def _log_level(value: Any) -> str:
+    """Accept known logging level names (case-insensitive), as uppercase."""
+    level = _strict_str(value).upper()
+    if level not in _VALID_LOG_LEVELS:
+        raise ValueError("unknown log level")
+    return level
+
+
+def _timestamp_format(value: Any) -> str:
+    """Accept formats that time.strftime() on this platform can render."""
+    fmt = _strict_str(value)
+    time.strftime(fmt)
+    return fmt
+
+
+# Field name -> coercion function. A coercion that raises ValueError or
+# TypeError makes validate_config() fall back to the default value.
+_FIELD_SCHEMA: dict[str, Callable[[Any], Any]] = {
+    "max_log_size_mb": _non_negative_int,
+    "log_backup_count": _non_negative_int,
+    "input_history_size": _non_negative_int,
+    "max_messages_per_room": _non_negative_int,
+    "reconnect_delay_seconds": _non_negative_int,
+    "connection_timeout_seconds": _non_negative_int,
+    "ping_interval_seconds": _non_negative_int,
+    "rate_warning_threshold": _unit_float,
+    "log_to_file": _strict_bool,
+    "log_to_console": _strict_bool,
+    "rate_limit_enabled": _strict_bool,
+    "save_input_history": _strict_bool,
+    "show_timestamps": _strict_bool,
+    "auto_reconnect": _strict_bool,
+    "hub_hash": _strict_str,
+    "nickname": _strict_str,
+    "identity_path": _strict_str,
+    "dest_name": _strict_str,
+    "configdir": _strict_str,
+    "log_level": _log_level,
+    "timestamp_format": _timestamp_format,
+}
+
+
 def validate_config(config: dict[str, Any]) -> dict[str, Any]:
     """Validate and sanitize config values.
 
@@ -100,62 +196,19 @@ def validate_config(config: dict[str, Any]) -> dict[str, Any]:
     Returns:
         Validated and sanitized configuration
     """
-    defaults = get_default_config()
-
-    int_fields = [
-        "max_log_size_mb",
-        "log_backup_count",
-        "input_history_size",
-        "max_messages_per_room",
-        "reconnect_delay_seconds",
-        "connection_timeout_seconds",
-        "ping_interval_seconds",
-    ]
-    for field in int_fields:
-        if field in config:
-            try:
-                config[field] = int(config[field])
-                if config[field] < 0:
-                    config[field] = defaults[field]
-            except (ValueError, TypeError):
-                config[field] = defaults[field]
-
-    float_fields = ["rate_warning_threshold"]
-    for field in float_fields:
-        if field in config:
-            try:
-                config[field] = float(config[field])
-                if not (0.0 <= config[field] <= 1.0):
-                    config[field] = defaults[field]
-            except (ValueError, TypeError):
-                config[field] = defaults[field]
-
-    bool_fields = [
-        "log_to_file",
-        "log_to_console",
-        "rate_limit_enabled",
-        "save_input_history",
-        "show_timestamps",
-        "auto_reconnect",
-    ]
-    for field in bool_fields:
-        if field in config:
-            if not isinstance(config[field], bool):
-                config[field] = defaults[field]
-
-    str_fields = [
-        "hub_hash",
-        "nickname",
-        "identity_path",
-        "dest_name",
-        "configdir",
-        "log_level",
-        "timestamp_format",
-    ]
-    for field in str_fields:
-        if field in config:
-            if not isinstance(config[field], str):
-                config[field] = defaults[field]
+    defaults = _default_config()
+
+    for field, value in config.items():
+        coerce = _FIELD_SCHEMA.get(field)
+        if coerce is None:
+            continue
+        try:
+            config[field] = coerce(value)
+        except (ValueError, TypeError) as e:
+            logger.warning(
+                f"Invalid {field} {value!r} ({e}), using default {defaults[field]!r}"
+            )
+            config[field] = defaults[field]
 
     if "auto_join_rooms" in config:
         if not isinstance(config["auto_join_rooms"], list):
@@ -163,7 +216,7 @@ def validate_config(config: dict[str, Any]) -> dict[str, Any]:
             if isinstance(legacy_room, str) and legacy_room.strip():
                 config["auto_join_rooms"] = [legacy_room.strip()]
             else:
-                config["auto_join_rooms"] = defaults["auto_join_rooms"]
+                config["auto_join_rooms"] = list(defaults["auto_join_rooms"])
         else:
             config["auto_join_rooms"] = [
                 str(room).strip() for room in config["auto_join_rooms"] if str(room).strip()
@@ -173,10 +226,9 @@ def validate_config(config: dict[str, Any]) -> dict[str, Any]:
         if isinstance(legacy_room, str) and legacy_room.strip():
             config["auto_join_rooms"] = [legacy_room.strip()]
         else:
-            config["auto_join_rooms"] = defaults["auto_join_rooms"]
+            config["auto_join_rooms"] = list(defaults["auto_join_rooms"])
 
-    valid_log_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-    if config.get("log_level", "").upper() not in valid_log_levels:
+    if "log_level" not in config:
         config["log_level"] = defaults["log_level"]
 
     return config
@@ -195,8 +247,7 @@ def load_config() -> dict[str, Any]:
     if config_path.exists():
         logger.info(f"Loading config from {config_path}")
         try:
-            with open(config_path, encoding="utf-8") as f:
-                saved_config = json.load(f)
+            saved_config = json_loads(config_path.read_bytes())
         except Exception as e:
             logger.warning(f"Failed to load config from {config_path}: {e}")
     else:
@@ -225,6 +276,9 @@ def load_config() -> dict[str, Any]:
 def save_config(config: dict[str, Any]) -> None:
     """Save configuration.
 
+    The file is left untouched if its contents would not change, and is
+    otherwise replaced atomically via a temporary file.
+
     Args:
         config: Configuration dictionary to save
     """
@@ -232,7 +286,15 @@ def save_config(config: dict[str, Any]) -> None:
     config_path.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        with open(config_path, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=2)
+        data = json_dumps(config)
+        try:
+            if config_path.read_bytes() == data:
+                return
+        except FileNotFoundError:
+            pass
+
+        tmp_path = config_path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, config_path)
     except Exception as e:
         raise RuntimeError(f"Failed to save config: {e}") from e
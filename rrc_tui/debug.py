@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterator
 from typing import Any
 
 from .constants import (
@@ -51,6 +52,7 @@ from .constants import (
 )
 
 logger = logging.getLogger(__name__)
+_is_enabled_for = logger.isEnabledFor
 
 
 MESSAGE_TYPES = {
@@ -123,6 +125,17 @@ RESOURCE_KINDS = {
 }
 
 
+def _dense_table(names: dict[int, str]) -> tuple[str | None, ...]:
+    """Flatten a small-int keyed name map into a tuple indexed by key."""
+    return tuple(names.get(i) for i in range(max(names) + 1))
+
+
+# Type and key constants are small, dense ints, so the hot-path lookups
+# index these tuples instead of probing the dicts above.
+_MESSAGE_TYPE_TABLE = _dense_table(MESSAGE_TYPES)
+_ENVELOPE_KEY_TABLE = _dense_table(ENVELOPE_KEYS)
+
+
 def message_type_name(msg_type: int) -> str:
     """Get human-readable name for message type.
 
@@ -132,7 +145,11 @@ def message_type_name(msg_type: int) -> str:
     Returns:
         String name of message type or "UNKNOWN(n)"
     """
-    return MESSAGE_TYPES.get(msg_type, f"UNKNOWN({msg_type})")
+    if type(msg_type) is int and 0 <= msg_type < len(_MESSAGE_TYPE_TABLE):
+        name = _MESSAGE_TYPE_TABLE[msg_type]
+    else:
+        name = MESSAGE_TYPES.get(msg_type)
+    return name or f"UNKNOWN({msg_type})"
 
 
 def envelope_key_name(key: int) -> str:
@@ -144,57 +161,59 @@ def envelope_key_name(key: int) -> str:
     Returns:
         String name of key or "UNKNOWN_KEY(n)"
     """
-    return ENVELOPE_KEYS.get(key, f"UNKNOWN_KEY({key})")
-
+    if type(key) is int and 0 <= key < len(_ENVELOPE_KEY_TABLE):
+        name = _ENVELOPE_KEY_TABLE[key]
+    else:
+        name = ENVELOPE_KEYS.get(key)
+    return name or f"UNKNOWN_KEY({key})"
 
-def format_envelope_debug(envelope: dict[int, Any]) -> str:
-    """Format envelope for debug logging.
 
-    Args:
-        envelope: RRC protocol envelope
+def _fmt_bytes(value: Any) -> Any:
+    """Abbreviate bytes to their first 8 bytes in hex; pass others through."""
+    if isinstance(value, bytes):
+        return f"{value[:8].hex()}..."
+    return value
 
-    Returns:
-        Human-readable string representation
-    """
-    parts = []
-    msg_type = envelope.get(K_T, -1)
-    type_name = message_type_name(msg_type)
 
-    parts.append(f"Type: {type_name}")
+def _iter_envelope_parts(envelope: dict[int, Any]) -> Iterator[str]:
+    """Yield the formatted fields of an envelope in display order."""
+    yield f"Type: {message_type_name(envelope.get(K_T, -1))}"
 
     if K_ID in envelope:
-        msg_id = envelope[K_ID]
-        if isinstance(msg_id, bytes):
-            parts.append(f"ID: {msg_id.hex()[:16]}...")
-        else:
-            parts.append(f"ID: {msg_id}")
+        yield f"ID: {_fmt_bytes(envelope[K_ID])}"
 
     if K_ROOM in envelope:
-        parts.append(f"Room: {envelope[K_ROOM]}")
+        yield f"Room: {envelope[K_ROOM]}"
 
     if K_SRC in envelope:
-        src = envelope[K_SRC]
-        if isinstance(src, bytes):
-            parts.append(f"Src: {src.hex()[:16]}...")
-        else:
-            parts.append(f"Src: {src}")
+        yield f"Src: {_fmt_bytes(envelope[K_SRC])}"
 
     if K_NICK in envelope:
-        parts.append(f"Nick: {envelope[K_NICK]}")
+        yield f"Nick: {envelope[K_NICK]}"
 
     if K_BODY in envelope:
         body = envelope[K_BODY]
         if isinstance(body, str):
             preview = body[:50] + "..." if len(body) > 50 else body
-            parts.append(f"Body: '{preview}'")
+            yield f"Body: '{preview}'"
         elif isinstance(body, dict):
-            parts.append(f"Body: dict({len(body)} keys)")
+            yield f"Body: dict({len(body)} keys)"
         elif isinstance(body, list):
-            parts.append(f"Body: list({len(body)} items)")
+            yield f"Body: list({len(body)} items)"
         else:
-            parts.append(f"Body: {type(body).__name__}")
+            yield f"Body: {type(body).__name__}"
+
+
+def format_envelope_debug(envelope: dict[int, Any]) -> str:
+    """Format envelope for debug logging.
 
-    return " | ".join(parts)
+    Args:
+        envelope: RRC protocol envelope
+
+    Returns:
+        Human-readable string representation
+    """
+    return " | ".join(_iter_envelope_parts(envelope))
 
 
 def log_envelope_debug(envelope: dict[int, Any], prefix: str = "") -> None:
@@ -204,11 +223,12 @@ def log_envelope_debug(envelope: dict[int, Any], prefix: str = "") -> None:
         envelope: RRC protocol envelope
         prefix: Optional prefix for log message (e.g., "RX" or "TX")
     """
-    if logger.isEnabledFor(logging.DEBUG):
-        msg = format_envelope_debug(envelope)
-        if prefix:
-            msg = f"{prefix}: {msg}"
-        logger.debug(msg)
+    if not _is_enabled_for(logging.DEBUG):
+        return
+    msg = format_envelope_debug(envelope)
+    if prefix:
+        msg = f"{prefix}: {msg}"
+    logger.debug(msg)
 
 
 def validate_envelope_structure(envelope: dict[int, Any]) -> list[str]:
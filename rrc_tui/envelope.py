@@ -1,17 +1,44 @@
 from __future__ import annotations
 
 import os
+import threading
 import time
 
 from .constants import K_BODY, K_ID, K_ROOM, K_SRC, K_T, K_TS, K_V, RRC_VERSION
 
 
 def now_ms() -> int:
-    return int(time.time() * 1000)
+    return time.time_ns() // 1_000_000
+
+
+# Message IDs are served from a block of urandom output so that a busy
+# sender makes one getrandom() call per 512 IDs instead of one per message.
+_MSG_ID_BYTES = 8
+_RAND_BLOCK_BYTES = 4096
+_rand_lock = threading.Lock()
+_rand_buf = b""
+_rand_pos = 0
+
+
+def _reset_rand_buf() -> None:
+    # A forked child must not hand out the IDs its parent will also use.
+    global _rand_buf, _rand_pos
+    _rand_buf = b""
+    _rand_pos = 0
+
+
+os.register_at_fork(after_in_child=_reset_rand_buf)
 
 
 def msg_id() -> bytes:
-    return os.urandom(8)
+    global _rand_buf, _rand_pos
+    with _rand_lock:
+        if _rand_pos + _MSG_ID_BYTES > len(_rand_buf):
+            _rand_buf = os.urandom(_RAND_BLOCK_BYTES)
+            _rand_pos = 0
+        start = _rand_pos
+        _rand_pos = start + _MSG_ID_BYTES
+        return _rand_buf[start:_rand_pos]
 
 
 def make_envelope(
@@ -25,9 +52,9 @@ def make_envelope(
 ) -> dict:
     env: dict[int, object] = {
         K_V: RRC_VERSION,
-        K_T: int(msg_type),
-        K_ID: mid or msg_id(),
-        K_TS: ts or now_ms(),
+        K_T: msg_type,
+        K_ID: mid if mid is not None else msg_id(),
+        K_TS: ts if ts is not None else now_ms(),
         K_SRC: src,
     }
     if room is not None:
@@ -37,47 +64,41 @@ def make_envelope(
     return env
 
 
+# Expected value type and error message for each known envelope key.
+_FIELD_TYPES: dict[int, tuple[type, str]] = {
+    K_V: (int, "envelope version must be an integer"),
+    K_T: (int, "envelope message type must be an integer"),
+    K_ID: (bytes, "envelope message ID must be bytes"),
+    K_TS: (int, "envelope timestamp must be an integer"),
+    K_SRC: (bytes, "envelope source must be bytes"),
+    K_ROOM: (str, "envelope room must be a string"),
+}
+
+_REQUIRED_KEYS = frozenset((K_V, K_T, K_ID, K_TS, K_SRC))
+
+
 def validate_envelope(env: dict) -> None:
     if not isinstance(env, dict):
         raise TypeError("envelope must be a CBOR map (dict)")
 
-    for k in env.keys():
+    for k, v in env.items():
         if not isinstance(k, int):
             raise TypeError("envelope keys must be integers")
         if k < 0:
             raise ValueError("envelope keys must be unsigned integers")
+        spec = _FIELD_TYPES.get(k)
+        if spec is not None and not isinstance(v, spec[0]):
+            raise TypeError(spec[1])
 
-    for k in (K_V, K_T, K_ID, K_TS, K_SRC):
-        if k not in env:
-            raise ValueError(f"envelope missing required key {k}")
+    if not _REQUIRED_KEYS.issubset(env.keys()):
+        for k in (K_V, K_T, K_ID, K_TS, K_SRC):
+            if k not in env:
+                raise ValueError(f"envelope missing required key {k}")
 
-    version = env.get(K_V)
-    if not isinstance(version, int):
-        raise TypeError("envelope version must be an integer")
+    version = env[K_V]
     if version != RRC_VERSION:
         raise ValueError(f"unsupported envelope version {version}")
-
-    msg_type = env.get(K_T)
-    if not isinstance(msg_type, int):
-        raise TypeError("envelope message type must be an integer")
-    if msg_type < 0:
+    if env[K_T] < 0:
         raise ValueError("envelope message type must be unsigned")
-
-    mid = env.get(K_ID)
-    if not isinstance(mid, bytes):
-        raise TypeError("envelope message ID must be bytes")
-
-    timestamp = env.get(K_TS)
-    if not isinstance(timestamp, int):
-        raise TypeError("envelope timestamp must be an integer")
-    if timestamp < 0:
+    if env[K_TS] < 0:
         raise ValueError("envelope timestamp must be unsigned")
-
-    src = env.get(K_SRC)
-    if not isinstance(src, bytes):
-        raise TypeError("envelope source must be bytes")
-
-    if K_ROOM in env:
-        room = env[K_ROOM]
-        if not isinstance(room, str):
-            raise TypeError("envelope room must be a string")
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 
@@ -13,6 +15,8 @@ class LogManager:
     def __init__(self):
         self.log_dir = Path.home() / ".rrc-tui" / "logs"
         self.log_file = self.log_dir / "rrc-tui.log"
+        self._listener: QueueListener | None = None
+        atexit.register(self.stop)
 
     def setup_logging(
         self,
@@ -34,7 +38,9 @@ class LogManager:
         root_logger = logging.getLogger()
         root_logger.setLevel(getattr(logging, level.upper(), logging.INFO))
 
+        self.stop()
         root_logger.handlers.clear()
+        handlers: list[logging.Handler] = []
 
         formatter = logging.Formatter(
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -50,9 +56,26 @@ class LogManager:
                 encoding="utf-8",
             )
             file_handler.setFormatter(formatter)
-            root_logger.addHandler(file_handler)
+            handlers.append(file_handler)
 
         if log_to_console:
             console_handler = logging.StreamHandler()
             console_handler.setFormatter(formatter)
-            root_logger.addHandler(console_handler)
+            handlers.append(console_handler)
+
+        if handlers:
+            # Callers only enqueue records; a listener thread does the I/O.
+            log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+            root_logger.addHandler(QueueHandler(log_queue))
+            self._listener = QueueListener(
+                log_queue, *handlers, respect_handler_level=True
+            )
+            self._listener.start()
+
+    def stop(self) -> None:
+        """Flush queued log records and stop the writer thread."""
+        if self._listener is not None:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
@@ -5,6 +5,8 @@ import sys
 from .config import FirstLaunchException, load_config
 from .logging_manager import LogManager
 
+_MB = 1 << 20
+
 
 def main():
     """Entry point for the TUI application."""
@@ -28,17 +30,17 @@ def main():
 
     log_manager = LogManager()
     log_manager.setup_logging(
-        level=config.get("log_level", "INFO"),
-        log_to_file=config.get("log_to_file", True),
-        log_to_console=config.get("log_to_console", False),
-        max_bytes=config.get("max_log_size_mb", 10) * 1024 * 1024,
-        backup_count=config.get("log_backup_count", 5),
+        level=config["log_level"],
+        log_to_file=config["log_to_file"],
+        log_to_console=config["log_to_console"],
+        max_bytes=config["max_log_size_mb"] * _MB,
+        backup_count=config["log_backup_count"],
     )
 
     try:
         from .tui import run_textual_tui
 
-        run_textual_tui()
+        run_textual_tui(config)
     except ImportError:
         print(
             "Error: Textual library not installed. Install with: pip install textual",
@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
-import json
+import functools
+import gzip
+import heapq
 import logging
+import os
+import re
+import sys
 import threading
 import time
+from collections import deque
 from collections.abc import Callable
 from dataclasses import dataclass, field
-from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 import RNS
 from rich.text import Text
@@ -32,6 +38,7 @@ from textual.widgets import (
 )
 
 from .client import Client, ClientConfig
+from .codec import decode, json_dumps, json_loads
 from .config import load_config
 from .constants import (
     B_WELCOME_HUB,
@@ -60,58 +67,145 @@ logger = logging.getLogger(__name__)
 MAX_HUB_ANNOUNCE_DATA_BYTES = 10240
 MAX_HUB_NAME_LENGTH = 200
 MAX_MESSAGES_PER_ROOM_DEFAULT = 500
+GZIP_MAGIC = b"\x1f\x8b"
+HUB_CACHE_FLUSH_INTERVAL_S = 5.0
+REFRESH_DEBOUNCE_S = 0.05
+MESSAGE_FLUSH_INTERVAL_S = 0.05
+MAX_PENDING_WRITES = 64
+
+# Bits for RRCTextualApp._schedule_refresh().
+_REFRESH_ROOM_LIST = 1
+_REFRESH_ROOM_INFO = 2
+_REFRESH_USER_LIST = 4
+
+# Room info updates announced by the hub in NOTICE text.
+_RE_ROOM_FULL = re.compile(r"room (\S+):[^;]*;\s*mode=([^;]+);\s*topic=(.+)")
+_RE_MODE = re.compile(r"mode for (\S+) is now:\s*(.+)")
+_RE_TOPIC = re.compile(r"topic for (\S+) is now:\s*(.+)")
+
+# Hub limit key -> display format for the limits line shown on WELCOME.
+_LIMIT_FIELDS = (
+    (L_MAX_NICK_BYTES, "nick: {}B"),
+    (L_MAX_ROOM_NAME_BYTES, "room: {}B"),
+    (L_MAX_MSG_BODY_BYTES, "msg: {}B"),
+    (L_MAX_ROOMS_PER_SESSION, "rooms: {}"),
+    (L_RATE_LIMIT_MSGS_PER_MINUTE, "rate: {}/min"),
+)
+
+# Message style name -> Rich style applied in the message log.
+_MESSAGE_STYLES = {
+    "own_msg_pending": "yellow",
+    "own_msg_confirmed": "green",
+    "own_msg_failed": "red",
+    "command": "magenta",
+    "notice": "cyan",
+    "error": "red bold",
+    "system": "green",
+}
 
 
 @dataclass
 class RoomState:
     """Consolidated state for a chat room."""
 
-    messages: list[tuple[str, str]] = field(default_factory=list)
+    messages: deque[tuple[str, str]] = field(
+        default_factory=lambda: deque(maxlen=MAX_MESSAGES_PER_ROOM_DEFAULT)
+    )
+    # Identity hashes (hex), interned so a user present in several rooms
+    # shares one string and set probes can short-circuit on identity.
     users: set[str] = field(default_factory=set)
+    # Display nicks of ``users`` in sorted order; reset to None whenever
+    # membership or a member's nickname changes.
+    user_rows: list[str] | None = None
     mode: str = ""
     topic: str = ""
     unread_count: int = 0
+    # Total messages ever appended, so an absolute sequence number stays
+    # valid as the bounded buffer drops old entries from the left.
+    appended: int = 0
+    # msg_id -> sequence number of our own messages awaiting confirmation.
+    pending_positions: dict[bytes, int] = field(default_factory=dict)
+
+    def pop_pending_index(self, msg_id: bytes) -> int | None:
+        """Return the buffer index of a pending message, if still buffered.
+
+        Only call this on the UI thread, which is the one that appends.
+        """
+        seq = self.pending_positions.pop(msg_id, None)
+        if seq is None:
+            return None
+        index = seq - (self.appended - len(self.messages))
+        if 0 <= index < len(self.messages):
+            return index
+        return None
 
 
 class PendingMessageTracker:
-    """Thread-safe tracker for pending message confirmations."""
+    """Thread-safe tracker for pending message confirmations.
+
+    ``_pending`` is never mutated in place: writers build a new dict under
+    ``_lock`` and rebind it, so readers can iterate a snapshot without
+    taking the lock. ``_expiry`` is a min-heap of (deadline, msg_id) so the
+    sweep only visits messages that have actually timed out; entries for
+    confirmed messages are skipped lazily when they reach the top.
+    Send times and deadlines use ``time.monotonic()`` so wall-clock
+    adjustments cannot expire or reprieve pending messages.
+    """
 
     def __init__(self, timeout_seconds: float = 30.0):
         self.timeout_seconds = timeout_seconds
         self._pending: dict[bytes, tuple[str, str, float]] = {}
+        self._expiry: list[tuple[float, bytes]] = []
         self._lock = threading.Lock()
         self._checker_running = False
         self._checker_thread: threading.Thread | None = None
+        self._wake = threading.Event()
 
     def add(self, msg_id: bytes, room: str, text: str) -> None:
         """Add a pending message."""
+        sent_time = time.monotonic()
         with self._lock:
-            self._pending[msg_id] = (room, text, time.time())
+            self._pending = {**self._pending, msg_id: (room, text, sent_time)}
+            heapq.heappush(self._expiry, (sent_time + self.timeout_seconds, msg_id))
+        self._wake.set()
 
     def confirm(self, msg_id: bytes) -> tuple[str, str, float] | None:
         """Confirm and remove a pending message. Returns the pending data if found."""
         with self._lock:
-            return self._pending.pop(msg_id, None)
+            pending = self._pending
+            data = pending.get(msg_id)
+            if data is not None:
+                self._pending = {k: v for k, v in pending.items() if k != msg_id}
+            return data
 
     def get_timed_out(self) -> list[tuple[bytes, str, str]]:
         """Get and remove all timed out messages."""
-        current_time = time.time()
+        current_time = time.monotonic()
+        expiry = self._expiry
+        if not expiry or expiry[0][0] > current_time:
+            return []
+
         timed_out = []
         with self._lock:
-            expired = [
-                (msg_id, room, text)
-                for msg_id, (room, text, sent_time) in self._pending.items()
-                if current_time - sent_time > self.timeout_seconds
-            ]
-            for msg_id, _, _ in expired:
-                del self._pending[msg_id]
-            timed_out = expired
+            pending = self._pending
+            expiry = self._expiry
+            while expiry and expiry[0][0] <= current_time:
+                _, msg_id = heapq.heappop(expiry)
+                data = pending.get(msg_id)
+                if data is not None:
+                    timed_out.append((msg_id, data[0], data[1]))
+            if timed_out:
+                expired_ids = {msg_id for msg_id, _, _ in timed_out}
+                self._pending = {
+                    k: v for k, v in pending.items() if k not in expired_ids
+                }
         return timed_out
 
     def clear(self) -> None:
         """Clear all pending messages."""
         with self._lock:
-            self._pending.clear()
+            self._pending = {}
+            self._expiry = []
 
     def start_checker(
         self, on_timeout_callback: Callable[[bytes, str, str], None]
@@ -123,15 +217,22 @@ class PendingMessageTracker:
         self._checker_running = True
 
         def timeout_checker():
+            # Sleep until the earliest deadline, or until add()/stop_checker()
+            # sets the wake event, rather than polling on a fixed interval.
             while self._checker_running:
                 try:
                     timed_out = self.get_timed_out()
                     for msg_id, room, text in timed_out:
                         on_timeout_callback(msg_id, room, text)
-                    time.sleep(1.0)
+                    expiry = self._expiry
+                    wait_s = (
+                        max(0.0, expiry[0][0] - time.monotonic()) if expiry else None
+                    )
                 except Exception as e:
                     logger.error(f"Error in timeout checker: {e}")
-                    time.sleep(1.0)
+                    wait_s = 1.0
+                self._wake.wait(wait_s)
+                self._wake.clear()
 
         self._checker_thread = threading.Thread(
             target=timeout_checker, daemon=True, name="msg-timeout-checker"
@@ -141,24 +242,45 @@ class PendingMessageTracker:
     def stop_checker(self) -> None:
         """Stop the background timeout checker thread."""
         self._checker_running = False
+        self._wake.set()
         if self._checker_thread and self._checker_thread.is_alive():
             self._checker_thread.join(timeout=2.0)
             self._checker_thread = None
 
 
 class HubCacheManager:
-    """Manages persistent storage of discovered RRC hubs."""
+    """Manages persistent storage of discovered RRC hubs.
 
-    def __init__(self, cache_path: Path):
+    The cache is written as gzip-compressed compact JSON. If it does not
+    exist yet, the plain JSON cache from older versions is read instead and
+    left in place, so downgrading keeps a readable cache.
+    """
+
+    def __init__(self, cache_path: Path, legacy_path: Path | None = None):
         self.cache_path = cache_path
+        self.legacy_path = legacy_path
         self.hubs: dict[str, dict] = {}
 
+    def _read_cache(self) -> bytes | None:
+        """Return the raw cache contents, falling back to the legacy file."""
+        for path in (self.cache_path, self.legacy_path):
+            if path is None:
+                continue
+            try:
+                raw = path.read_bytes()
+            except FileNotFoundError:
+                continue
+            if raw[:2] == GZIP_MAGIC:
+                raw = gzip.decompress(raw)
+            return raw
+        return None
+
     def load(self) -> dict[str, dict]:
         """Load discovered hubs from cache file."""
         try:
-            if self.cache_path.exists():
-                with open(self.cache_path, encoding="utf-8") as f:
-                    data = json.load(f)
+            raw = self._read_cache()
+            if raw is not None:
+                data = json_loads(raw)
 
                 if isinstance(data, dict):
                     for hash_hex, hub_info in data.items():
@@ -168,7 +290,7 @@ class HubCacheManager:
                             self.hubs[hash_hex] = hub_info
 
                     logger.info(f"Loaded {len(self.hubs)} discovered hub(s) from cache")
-        except (OSError, json.JSONDecodeError, ValueError) as e:
+        except (OSError, ValueError, EOFError) as e:
             logger.error(f"Failed to load discovered hubs: {e}")
         except Exception as e:
             logger.exception(f"Unexpected error loading discovered hubs: {e}")
@@ -179,8 +301,12 @@ class HubCacheManager:
         """Save discovered hubs to cache file."""
         try:
             self.cache_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.cache_path, "w", encoding="utf-8") as f:
-                json.dump(hubs, f, indent=2)
+            data = gzip.compress(
+                json_dumps(hubs, indent=False), compresslevel=1, mtime=0
+            )
+            tmp_path = self.cache_path.with_suffix(".gz.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, self.cache_path)
             logger.debug(f"Saved {len(hubs)} discovered hub(s) to cache")
         except (OSError, TypeError, ValueError) as e:
             logger.error(f"Failed to save discovered hubs: {e}")
@@ -208,40 +334,57 @@ class MessageFormatter:
 
     def __init__(self, config: dict):
         self.config = config
+        self._show_timestamps = bool(config.get("show_timestamps", True))
+        timestamp_format = config.get("timestamp_format", "%H:%M:%S")
+        self._timestamp_format = f"[{timestamp_format}] "
 
     def format_timestamp(self) -> str:
         """Format current timestamp."""
-        if self.config.get("show_timestamps", True):
-            fmt = self.config.get("timestamp_format", "%H:%M:%S")
-            return f"[{datetime.now().strftime(fmt)}] "
+        if self._show_timestamps:
+            return time.strftime(self._timestamp_format)
         return ""
 
+    _PREFIXES = {
+        "system": "--- ",
+        "notice": "*** ",
+        "error": "!!! ERROR: ",
+        "command": "",
+    }
+
+    def format(
+        self,
+        kind: str,
+        text: str,
+        nick: str | None = None,
+        include_timestamp: bool = True,
+    ) -> str:
+        """Format a line of the given kind; a nick makes it a user message."""
+        timestamp = self.format_timestamp() if include_timestamp else ""
+        if nick is not None:
+            return f"{timestamp}<{nick}> {text}"
+        return f"{timestamp}{self._PREFIXES[kind]}{text}"
+
     def format_user_message(
         self, nick: str, text: str, include_timestamp: bool = True
     ) -> str:
         """Format a user message with timestamp and nickname."""
-        timestamp = self.format_timestamp() if include_timestamp else ""
-        return f"{timestamp}<{nick}> {text}"
+        return self.format("user", text, nick, include_timestamp)
 
     def format_system_message(self, text: str, include_timestamp: bool = True) -> str:
         """Format a system message."""
-        timestamp = self.format_timestamp() if include_timestamp else ""
-        return f"{timestamp}--- {text}"
+        return self.format("system", text, None, include_timestamp)
 
     def format_notice(self, text: str, include_timestamp: bool = True) -> str:
         """Format a notice message."""
-        timestamp = self.format_timestamp() if include_timestamp else ""
-        return f"{timestamp}*** {text}"
+        return self.format("notice", text, None, include_timestamp)
 
     def format_error(self, text: str, include_timestamp: bool = True) -> str:
         """Format an error message."""
-        timestamp = self.format_timestamp() if include_timestamp else ""
-        return f"{timestamp}!!! ERROR: {text}"
+        return self.format("error", text, None, include_timestamp)
 
     def format_command(self, text: str, include_timestamp: bool = True) -> str:
         """Format a slash command."""
-        timestamp = self.format_timestamp() if include_timestamp else ""
-        return f"{timestamp}{text}"
+        return self.format("command", text, None, include_timestamp)
 
 
 def format_time_ago(timestamp: float) -> str:
@@ -256,15 +399,49 @@ def format_time_ago(timestamp: float) -> str:
     if timestamp <= 0:
         return "Unknown"
 
-    elapsed = int(time.time() - timestamp)
-    if elapsed < 60:
+    return _format_minutes_ago(int(time.time() - timestamp) // 60)
+
+
+# (upper bound in minutes, divisor, suffix) for each bounded relative-time
+# bucket; anything older is shown in days.
+_TIME_AGO_BUCKETS: tuple[tuple[int, int, str], ...] = (
+    (60, 1, "m ago"),
+    (1440, 60, "h ago"),
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_minutes_ago(minutes: int) -> str:
+    """Render whole elapsed minutes; every output bucket is minute-aligned."""
+    if minutes < 1:
         return "Just now"
-    elif elapsed < 3600:
-        return f"{elapsed // 60}m ago"
-    elif elapsed < 86400:
-        return f"{elapsed // 3600}h ago"
-    else:
-        return f"{elapsed // 86400}d ago"
+    for limit, divisor, suffix in _TIME_AGO_BUCKETS:
+        if minutes < limit:
+            return f"{minutes // divisor}{suffix}"
+    return f"{minutes // 1440}d ago"
+
+
+def _may_be_cbor(app_data: bytes) -> bool:
+    """Cheaply rule out announce payloads that are plain text, not CBOR.
+
+    Maps and arrays start at 0x80 and above. Below that, only a CBOR text
+    string whose length header matches the payload length is accepted, or
+    an indefinite-length one; anything else is treated as a UTF-8 name
+    without attempting a decode.
+    """
+    first = app_data[0]
+    if first >= 0x80 or first == 0x7F:
+        return True
+    if 0x60 <= first <= 0x77:
+        return len(app_data) == 1 + first - 0x60
+    if 0x78 <= first <= 0x7B:
+        # 1-, 2-, 4- or 8-byte big-endian length follows the initial byte.
+        size = 1 << (first - 0x78)
+        end = 1 + size
+        if len(app_data) < end:
+            return False
+        return len(app_data) == end + int.from_bytes(app_data[1:end], "big")
+    return False
 
 
 class HubAnnounceHandler:
@@ -278,6 +455,9 @@ class HubAnnounceHandler:
         """
         self.app = app
         self.aspect_filter = "rrc.hub"
+        # Hubs re-announce the same app_data over and over, so the parsed
+        # and sanitized name is memoized per payload.
+        self._hub_name_for = functools.lru_cache(maxsize=128)(self._sanitized_hub_name)
 
     def _extract_hub_name_from_cbor(self, decoded: object) -> str | None:
         """Extract hub name from decoded CBOR data.
@@ -321,15 +501,14 @@ class HubAnnounceHandler:
         if not app_data or len(app_data) >= MAX_HUB_ANNOUNCE_DATA_BYTES:
             return None
 
-        try:
-            import cbor2
-
-            decoded = cbor2.loads(app_data)
-            hub_name = self._extract_hub_name_from_cbor(decoded)
-            if hub_name:
-                return hub_name
-        except Exception as e:
-            logger.debug(f"Failed to decode CBOR hub announce data: {e}")
+        if _may_be_cbor(app_data):
+            try:
+                decoded = decode(app_data)
+                hub_name = self._extract_hub_name_from_cbor(decoded)
+                if hub_name:
+                    return hub_name
+            except Exception as e:
+                logger.debug(f"Failed to decode CBOR hub announce data: {e}")
 
         try:
             hub_name = app_data.decode("utf-8")
@@ -340,6 +519,16 @@ class HubAnnounceHandler:
 
         return None
 
+    def _sanitized_hub_name(self, app_data: bytes) -> str | None:
+        """Parse and sanitize the hub name carried in announce app_data."""
+        hub_name = self._parse_hub_announce_data(app_data)
+        if not hub_name:
+            return None
+        return (
+            sanitize_display_name(hub_name, max_length=MAX_HUB_NAME_LENGTH, strict=True)
+            or None
+        )
+
     def received_announce(
         self,
         destination_hash: bytes,
@@ -350,14 +539,7 @@ class HubAnnounceHandler:
         try:
             hash_hex = destination_hash.hex()
 
-            hub_name = self._parse_hub_announce_data(app_data)
-
-            if not hub_name:
-                hub_name = f"Hub {hash_hex[:8]}"
-
-            sanitized_hub_name = sanitize_display_name(
-                hub_name, max_length=MAX_HUB_NAME_LENGTH, strict=True
-            )
+            sanitized_hub_name = self._hub_name_for(app_data)
             if not sanitized_hub_name:
                 sanitized_hub_name = f"Hub {hash_hex[:8]}"
 
@@ -367,20 +549,21 @@ class HubAnnounceHandler:
                 "last_seen": time.time(),
             }
 
-            if hasattr(self.app, "discovered_hubs"):
-                self.app.discovered_hubs[hash_hex] = hub_info
-                logger.info(
-                    f"Discovered RRC hub: {sanitized_hub_name} ({hash_hex[:16]}...)"
-                )
+            app = self.app
+            # Re-insert so the dict stays ordered oldest to newest.
+            known = app.discovered_hubs.pop(hash_hex, None) is not None
+            app.discovered_hubs[hash_hex] = hub_info
+            if not known:
+                app.hubs_version += 1
+            logger.info(
+                f"Discovered RRC hub: {sanitized_hub_name} ({hash_hex[:16]}...)"
+            )
 
-                if hasattr(self.app, "_save_discovered_hubs"):
-                    self.app._save_discovered_hubs()
+            # Persisted by the app's periodic flush, not per announce.
+            app.hubs_dirty = True
 
-                if (
-                    hasattr(self.app, "active_discovery_screen")
-                    and self.app.active_discovery_screen
-                ):
-                    self.app.active_discovery_screen.refresh_hub_list()
+            if app.active_discovery_screen:
+                app.active_discovery_screen.refresh_hub_list()
 
         except (AttributeError, KeyError, ValueError) as e:
             logger.warning(f"Error processing hub announcement: {e}")
@@ -545,6 +728,9 @@ class HubDiscoveryScreen(ModalScreen[str | None]):
         """Start hub discovery when mounted."""
         self.discovered_hubs: dict[str, str] = {}
         self.selected_hub_hash: str | None = None
+        self._hub_rows: list[tuple[ListItem, Static, str, str]] = []
+        self._row_prefixes: dict[str, tuple[str, str]] = {}
+        self._rendered_version = -1
         self.app.active_discovery_screen = self
         self._update_hub_list()
         if len(self.app.discovered_hubs) > 0:
@@ -601,30 +787,63 @@ class HubDiscoveryScreen(ModalScreen[str | None]):
             )
 
     def _update_hub_list(self) -> None:
-        """Update the hub list display."""
-        hub_list = self.query_one("#hub_list", ListView)
-        hub_list.clear()
+        """Update the hub list display.
 
-        sorted_hubs = sorted(
-            self.app.discovered_hubs.items(),
-            key=lambda x: x[1].get("last_seen", 0),
-            reverse=True,
-        )
+        The list is only rebuilt when the set of known hubs has changed;
+        otherwise the existing rows are relabelled in place.
+        """
+        version = self.app.hubs_version
+        rows = []
+        # discovered_hubs is kept in last_seen order, newest last.
+        prefixes = self._row_prefixes
+        for hub_hash, hub_info in reversed(tuple(self.app.discovered_hubs.items())):
+            # Only the relative time changes between refreshes; the
+            # "name (hash...) - " head is built once per hub name.
+            hub_name = hub_info["name"]
+            cached = prefixes.get(hub_hash)
+            if cached is None or cached[0] != hub_name:
+                cached = (hub_name, f"{hub_name} ({hub_hash[:16]}...) - ")
+                prefixes[hub_hash] = cached
+            self.discovered_hubs[hub_hash] = hub_name
+            rows.append((hub_hash, cached[1] + format_time_ago(hub_info["last_seen"])))
 
-        for hub_hash, hub_info in sorted_hubs:
-            hub_name = hub_info.get("name", f"Hub {hub_hash[:16]}...")
-            last_seen = hub_info.get("last_seen", 0)
-            time_str = format_time_ago(last_seen)
+        hub_list = self.query_one("#hub_list", ListView)
+        if version == self._rendered_version and len(rows) == len(self._hub_rows):
+            # A re-announce moves its hub to the top, so the highlight has
+            # to follow the hub rather than stay on the same row.
+            highlighted = hub_list.index
+            followed: tuple[int, str] | None = None
+            if highlighted is not None and highlighted < len(self._hub_rows):
+                followed = (highlighted, self._hub_rows[highlighted][3])
+
+            hub_rows = []
+            for (item, static, shown, shown_hash), (hub_hash, label) in zip(
+                self._hub_rows, rows, strict=True
+            ):
+                if label != shown or shown_hash != hub_hash:
+                    static.update(Text(label, no_wrap=True, overflow="ellipsis"))
+                    item.hub_hash = hub_hash  # type: ignore[attr-defined]
+                hub_rows.append((item, static, label, hub_hash))
+            self._hub_rows = hub_rows
+
+            if followed is not None:
+                old_index, followed_hash = followed
+                if rows[old_index][0] != followed_hash:
+                    for i, (hub_hash, _) in enumerate(rows):
+                        if hub_hash == followed_hash:
+                            hub_list.index = i
+                            break
+            return
 
-            text_obj = Text(
-                f"{hub_name} ({hub_hash[:16]}...) - {time_str}",
-                no_wrap=True,
-                overflow="ellipsis",
-            )
-            item = ListItem(Static(text_obj))
+        hub_list.clear()
+        self._hub_rows = []
+        for hub_hash, label in rows:
+            static = Static(Text(label, no_wrap=True, overflow="ellipsis"))
+            item = ListItem(static)
             item.hub_hash = hub_hash  # type: ignore[attr-defined]
-            self.discovered_hubs[hub_hash] = hub_name
-            hub_list.append(item)
+            self._hub_rows.append((item, static, label, hub_hash))
+        hub_list.extend(row[0] for row in self._hub_rows)
+        self._rendered_version = version
 
     def _update_status(self, status: str) -> None:
         """Update the status message."""
@@ -648,6 +867,7 @@ class HubDiscoveryScreen(ModalScreen[str | None]):
         """Handle refresh button press."""
         self.discovered_hubs.clear()
         self.selected_hub_hash = None
+        self._rendered_version = -1
         self.query_one("#connect_btn", Button).disabled = True
         self._update_hub_list()
         self._start_discovery()
@@ -678,14 +898,79 @@ class RoomButton(ListItem):
         super().__init__(**kwargs)
         self.room_name = room_name
         self.unread_count = unread_count
-        display_text = room_name
-        if unread_count > 0:
-            display_text = f"{room_name} ({unread_count})"
-        self.text_obj = Text(display_text, no_wrap=True, overflow="ellipsis")
+        self.text_obj = self._make_text()
+
+    def _make_text(self) -> Text:
+        display_text = self.room_name
+        if self.unread_count > 0:
+            display_text = f"{self.room_name} ({self.unread_count})"
+        return Text(display_text, no_wrap=True, overflow="ellipsis")
 
     def compose(self) -> ComposeResult:
         yield Static(self.text_obj)
 
+    def set_unread_count(self, unread_count: int) -> None:
+        """Update the unread badge without rebuilding the room list."""
+        self.unread_count = unread_count
+        self.text_obj = self._make_text()
+        for label in self.query(Static):
+            label.update(self.text_obj)
+
+
+class UserListView(ListView):
+    """User list that mounts its rows a page at a time.
+
+    Only enough rows to fill (and slightly overrun) the viewport are turned
+    into widgets; further pages are mounted as the list is scrolled or the
+    highlight reaches the last mounted row.
+    """
+
+    PAGE_SIZE = 50
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._rows: list[str] = []
+        self._mounted_rows = 0
+
+    def set_rows(self, rows: list[str]) -> None:
+        """Replace the list contents with the given display nicks."""
+        if not rows and not self._rows:
+            return
+        self.clear()
+        self._rows = rows
+        self._mounted_rows = 0
+        self._mount_next_page()
+
+    def _mount_next_page(self) -> None:
+        start = self._mounted_rows
+        end = min(start + self.PAGE_SIZE, len(self._rows))
+        if end <= start:
+            return
+        self.extend(
+            ListItem(Static(Text(f"  {nick}", no_wrap=True, overflow="ellipsis")))
+            for nick in self._rows[start:end]
+        )
+        self._mounted_rows = end
+        self.call_after_refresh(self._fill_viewport)
+
+    def _fill_viewport(self) -> None:
+        if self._mounted_rows < len(self._rows) and (
+            self.max_scroll_y - self.scroll_y <= self.size.height
+        ):
+            self._mount_next_page()
+
+    def on_resize(self, event: events.Resize) -> None:
+        self._fill_viewport()
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        self._fill_viewport()
+
+    def watch_index(self, old_index: int | None, new_index: int | None) -> None:
+        super().watch_index(old_index, new_index)
+        if new_index is not None and new_index >= self._mounted_rows - 1:
+            self._mount_next_page()
+
 
 class RRCTextualApp(App):
     """Textual-based TUI for RRC client."""
@@ -823,21 +1108,47 @@ class RRCTextualApp(App):
     link_active = reactive(False)
     latency_ms: reactive[float | None] = reactive(None, init=False)
 
-    def __init__(self):
+    def __init__(self, config: dict[str, Any] | None = None):
         super().__init__()
-        self.config = load_config()
+        self.config = config if config is not None else load_config()
         self.client: Client | None = None
         self.active_room: str = self.HUB_ROOM
         self.hub_name: str | None = None
         self.nickname_map: dict[str, str] = {}
         self.own_identity_hash: str | None = None
+        # Derived from config; refreshed by _refresh_own_nick() and not
+        # re-read on every message.
+        self._own_nick = ""
+        self._refresh_own_nick()
+        self._max_messages: int | None = (
+            self.config.get("max_messages_per_room", MAX_MESSAGES_PER_ROOM_DEFAULT)
+            or None
+        )
+        self._pending_refresh = 0
+        self._refresh_armed = False
+        # The app is normally run on the thread that builds it; on_mount
+        # records the thread again once the event loop is actually up.
+        self._ui_thread_id = threading.get_ident()
+        self._pending_writes: list[Text] = []
+        self._writes_armed = False
+        self._message_log_empty = True
 
         self.rooms: dict[str, RoomState] = {self.HUB_ROOM: RoomState()}
+        self._room_order: list[str] = [self.HUB_ROOM]
+        self._room_order_keys: set[str] = {self.HUB_ROOM}
+        self._room_buttons: dict[str, RoomButton] = {}
 
         self.discovered_hubs: dict[str, dict] = {}
-        self.active_discovery_screen = None
-        self.hub_cache_path = Path.home() / ".rrc-tui" / "discovered_hubs.json"
-        self.hub_cache_manager = HubCacheManager(self.hub_cache_path)
+        # Bumped whenever a hub is added, so the discovery screen knows
+        # when it must rebuild its list rather than relabel it.
+        self.hubs_version = 0
+        self.hubs_dirty = False
+        self.active_discovery_screen: HubDiscoveryScreen | None = None
+        cache_dir = Path.home() / ".rrc-tui"
+        self.hub_cache_path = cache_dir / "discovered_hubs.json.gz"
+        self.hub_cache_manager = HubCacheManager(
+            self.hub_cache_path, legacy_path=cache_dir / "discovered_hubs.json"
+        )
 
         self.message_formatter = MessageFormatter(self.config)
 
@@ -868,10 +1179,33 @@ class RRCTextualApp(App):
         self.discovered_hubs = self.hub_cache_manager.cleanup_old_hubs(
             self.discovered_hubs, max_age
         )
+        # Order once by last_seen; announces then keep the order by
+        # re-inserting each hub they update.
+        self.discovered_hubs = dict(
+            sorted(
+                self.discovered_hubs.items(),
+                key=lambda x: x[1].get("last_seen", 0),
+            )
+        )
 
     def _save_discovered_hubs(self) -> None:
         """Save discovered hubs to cache file."""
-        self.hub_cache_manager.save(self.discovered_hubs)
+        self.hub_cache_manager.save(dict(self.discovered_hubs))
+
+    def _flush_discovered_hubs(self) -> None:
+        """Save discovered hubs in a worker thread if they changed."""
+        if self.hubs_dirty:
+            self.hubs_dirty = False
+            # Save a snapshot so the announce thread can keep updating the
+            # live dict while the write is in flight.
+            self.run_worker(
+                functools.partial(
+                    self.hub_cache_manager.save, dict(self.discovered_hubs)
+                ),
+                thread=True,
+                exclusive=True,
+                group="hub-save",
+            )
 
     def compose(self) -> ComposeResult:
         """Compose the UI layout."""
@@ -890,16 +1224,26 @@ class RRCTextualApp(App):
 
         with Container(id="user_container"):
             yield Static("Users", classes="box-title")
-            yield ListView(id="user_list")
+            yield UserListView(id="user_list")
 
         yield Footer()
 
     def on_mount(self) -> None:
         """Initialize the app when mounted."""
+        self._ui_thread_id = threading.get_ident()
         self.title = "RRC TUI"
 
+        # Widgets updated on every message or membership change; look them
+        # up once rather than running a selector query per update.
+        self._message_log = self.query_one("#message_display", RichLog)
+        self._room_list = self.query_one("#room_list", ListView)
+        self._user_list = self.query_one("#user_list", UserListView)
+        self._user_container = self.query_one("#user_container")
+        self._room_info = self.query_one("#room_info", Static)
+        self._input_field = self.query_one("#input_field", Input)
+
         self.screen.add_class("hide-users")
-        self.query_one("#user_container").add_class("hidden")
+        self._user_container.add_class("hidden")
 
         self._update_room_list()
         self._update_room_info()
@@ -908,14 +1252,13 @@ class RRCTextualApp(App):
 
         self.set_timer(0.1, self._focus_input)
 
-        self.set_interval(1.0, self._update_link_status)
+        self.set_interval(HUB_CACHE_FLUSH_INTERVAL_S, self._flush_discovered_hubs)
 
     async def on_resize(self, event: events.Resize) -> None:
         """Handle terminal resize event by reflowing message text."""
         try:
             self._update_message_display()
-            message_log = self.query_one("#message_display", RichLog)
-            message_log.refresh()
+            self._message_log.refresh()
         except Exception as e:
             logger.debug(f"Error updating display on resize: {e}")
 
@@ -926,7 +1269,11 @@ class RRCTextualApp(App):
 
         This wrapper handles the case where callbacks might be called from the main thread
         (e.g., user-initiated disconnect) or from a background thread (e.g., network events).
+        On the UI thread the function is called directly, skipping the event loop hop.
         """
+        if threading.get_ident() == self._ui_thread_id:
+            func(*args, **kwargs)
+            return
         try:
             self.call_from_thread(func, *args, **kwargs)
         except RuntimeError as e:
@@ -935,14 +1282,10 @@ class RRCTextualApp(App):
             else:
                 raise
 
-    def _update_link_status(self) -> None:
-        """Check and update link status."""
-        if self.client and self.client.link:
-            self.link_active = self.client.link.status == RNS.Link.ACTIVE
-            if self.client.latency_ms is not None:
-                self.latency_ms = self.client.latency_ms
-        else:
-            self.link_active = False
+    def _update_link_status(self, active: bool) -> None:
+        """Update link status as reported by the client."""
+        self.link_active = active
+        if not active:
             self.latency_ms = None
 
     def watch_link_active(self, active: bool) -> None:
@@ -953,6 +1296,25 @@ class RRCTextualApp(App):
         """React to latency changes."""
         self._update_header()
 
+    def _schedule_refresh(self, flags: int) -> None:
+        """Coalesce room/user list redraws requested within a short window."""
+        self._pending_refresh |= flags
+        if not self._refresh_armed:
+            self._refresh_armed = True
+            self.set_timer(REFRESH_DEBOUNCE_S, self._flush_refresh)
+
+    def _flush_refresh(self) -> None:
+        """Run the redraws collected by _schedule_refresh()."""
+        flags = self._pending_refresh
+        self._pending_refresh = 0
+        self._refresh_armed = False
+        if flags & _REFRESH_ROOM_LIST:
+            self._update_room_list()
+        if flags & _REFRESH_ROOM_INFO:
+            self._update_room_info()
+        if flags & _REFRESH_USER_LIST:
+            self._update_user_list()
+
     def _update_header(self) -> None:
         """Update the header with current link status and latency."""
         header = self.query_one(Header)
@@ -966,46 +1328,58 @@ class RRCTextualApp(App):
 
     def _update_room_list(self) -> None:
         """Update the room list display."""
-        room_list = self.query_one("#room_list", ListView)
+        room_list = self._room_list
         room_list.clear()
 
-        rooms = [self.HUB_ROOM] + sorted(
-            [r for r in self.rooms.keys() if r != self.HUB_ROOM]
-        )
+        # Rooms change far less often than this list is redrawn, so the
+        # sorted order is only recomputed when the set of rooms differs.
+        if self.rooms.keys() != self._room_order_keys:
+            self._room_order_keys = set(self.rooms)
+            self._room_order = [self.HUB_ROOM] + sorted(
+                r for r in self._room_order_keys if r != self.HUB_ROOM
+            )
 
-        for room in rooms:
+        items = []
+        for room in self._room_order:
             room_state = self.rooms.get(room, RoomState())
             item = RoomButton(room, room_state.unread_count)
             if room == self.active_room:
                 item.add_class("room_active")
-            room_list.append(item)
+            items.append(item)
+        self._room_buttons = {item.room_name: item for item in items}
+        room_list.extend(items)
 
     def _update_user_list(self) -> None:
         """Update the user list for the active room."""
-        user_list = self.query_one("#user_list", ListView)
-        user_list.clear()
+        with self.batch_update():
+            user_list = self._user_list
 
-        user_container = self.query_one("#user_container")
-        screen = self.screen
+            user_container = self._user_container
+            screen = self.screen
 
-        if self.active_room == self.HUB_ROOM:
-            user_container.add_class("hidden")
-            screen.add_class("hide-users")
-        else:
-            user_container.remove_class("hidden")
-            screen.remove_class("hide-users")
-
-        if self.active_room in self.rooms:
-            room_state = self.rooms[self.active_room]
-            users = sorted(room_state.users)
-            for user_hash in users:
-                nick = self.nickname_map.get(user_hash, format_identity_hash(user_hash))
-                text_obj = Text(f"  {nick}", no_wrap=True, overflow="ellipsis")
-                user_list.append(ListItem(Static(text_obj)))
+            if self.active_room == self.HUB_ROOM:
+                user_container.add_class("hidden")
+                screen.add_class("hide-users")
+            else:
+                user_container.remove_class("hidden")
+                screen.remove_class("hide-users")
+
+            room_state = self.rooms.get(self.active_room)
+            if room_state is not None:
+                rows = room_state.user_rows
+                if rows is None:
+                    nickname_map = self.nickname_map
+                    rows = room_state.user_rows = [
+                        nickname_map.get(user_hash, format_identity_hash(user_hash))
+                        for user_hash in sorted(room_state.users)
+                    ]
+                user_list.set_rows(rows)
+            else:
+                user_list.set_rows([])
 
     def _update_room_info(self) -> None:
         """Update the room info header."""
-        room_info = self.query_one("#room_info", Static)
+        room_info = self._room_info
 
         info_parts = [self.active_room]
 
@@ -1020,14 +1394,28 @@ class RRCTextualApp(App):
 
     def _update_message_display(self) -> None:
         """Update the message display for the active room."""
-        message_log = self.query_one("#message_display", RichLog)
-        message_log.clear()
+        message_log = self._message_log
+        # The rebuild below covers anything still queued for the old view.
+        self._pending_writes.clear()
+        self._writes_armed = False
+
+        room_state = self.rooms.get(self.active_room)
+        messages = room_state.messages if room_state is not None else None
+        if not messages and self._message_log_empty:
+            return
 
-        if self.active_room in self.rooms:
-            room_state = self.rooms[self.active_room]
-            for style, text in room_state.messages:
-                rich_text = self._style_message_text(text, style)
-                message_log.write(rich_text)
+        with self.batch_update():
+            message_log.clear()
+            self._message_log_empty = not messages
+
+            if messages:
+                # One write renders and scrolls once for the whole buffer.
+                message_log.write(
+                    Text("\n").join(
+                        self._style_message_text(text, style)
+                        for style, text in messages
+                    )
+                )
 
     def _style_message_text(self, text: str, style: str) -> Text:
         """Apply styling to message text.
@@ -1040,26 +1428,17 @@ class RRCTextualApp(App):
             Styled Text object
         """
         rich_text = Text(text)
-        if style == "own_msg_pending":
-            rich_text.stylize("yellow")
-        elif style == "own_msg_confirmed":
-            rich_text.stylize("green")
-        elif style == "own_msg_failed":
-            rich_text.stylize("red")
-        elif style == "command":
-            rich_text.stylize("magenta")
-        elif style == "notice":
-            rich_text.stylize("cyan")
-        elif style == "error":
-            rich_text.stylize("red bold")
-        elif style == "system":
-            rich_text.stylize("green")
-
+        rich_style = _MESSAGE_STYLES.get(style)
+        if rich_style:
+            rich_text.stylize(rich_style)
         return rich_text
 
     def _append_message_to_display(self, style: str, text: str) -> None:
         """Append a single message to the display without full rebuild.
 
+        Lines are queued and written together after MESSAGE_FLUSH_INTERVAL_S,
+        or as soon as MAX_PENDING_WRITES are waiting.
+
         Args:
             style: Message style
             text: Message text
@@ -1067,9 +1446,26 @@ class RRCTextualApp(App):
         if self.active_room not in self.rooms:
             return
 
-        message_log = self.query_one("#message_display", RichLog)
-        rich_text = self._style_message_text(text, style)
-        message_log.write(rich_text)
+        pending = self._pending_writes
+        pending.append(self._style_message_text(text, style))
+        if len(pending) >= MAX_PENDING_WRITES:
+            self._flush_writes()
+        elif not self._writes_armed:
+            self._writes_armed = True
+            self.set_timer(MESSAGE_FLUSH_INTERVAL_S, self._flush_writes)
+
+    def _flush_writes(self) -> None:
+        """Write queued lines to the message log in one go."""
+        self._writes_armed = False
+        pending = self._pending_writes
+        if not pending:
+            return
+        self._pending_writes = []
+        # RichLog has no write_lines(); one write of the joined lines renders
+        # and scrolls once for the whole batch.
+        with self.batch_update():
+            self._message_log.write(Text("\n").join(pending))
+        self._message_log_empty = False
 
     def _switch_room(self, room: str) -> None:
         """Switch to a different room."""
@@ -1087,37 +1483,40 @@ class RRCTextualApp(App):
         self._update_user_list()
         self._update_message_display()
         try:
-            self.query_one("#input_field", Input).focus()
+            self._input_field.focus()
         except Exception as e:
             logger.debug(f"Could not focus input field: {e}")
 
     def _focus_input(self) -> None:
         """Helper method to focus the input field."""
         try:
-            self.query_one("#input_field", Input).focus()
+            self._input_field.focus()
         except Exception as e:
             logger.debug(f"Could not focus input field: {e}")
 
     def _add_message(self, room: str, style: str, message: str) -> None:
         """Add a message to a room."""
-        if room not in self.rooms:
-            self.rooms[room] = RoomState()
+        room_state = self.rooms.get(room)
+        if room_state is None:
+            room_state = self.rooms[room] = RoomState()
 
-        room_state = self.rooms[room]
-        room_state.messages.append((style, message))
-
-        max_messages = self.config.get(
-            "max_messages_per_room", MAX_MESSAGES_PER_ROOM_DEFAULT
-        )
-        if len(room_state.messages) > max_messages:
-            room_state.messages = room_state.messages[-max_messages:]
+        messages = room_state.messages
+        max_messages = self._max_messages
+        if messages.maxlen != max_messages:
+            messages = room_state.messages = deque(messages, maxlen=max_messages)
+        messages.append((style, message))
+        room_state.appended += 1
 
         if room == self.active_room:
             self._append_message_to_display(style, message)
         else:
-            if style not in ["system", "notice", "error"]:
+            if style not in ("system", "notice", "error"):
                 room_state.unread_count += 1
-                self._update_room_list()
+                button = self._room_buttons.get(room)
+                if button is not None:
+                    button.set_unread_count(room_state.unread_count)
+                else:
+                    self._schedule_refresh(_REFRESH_ROOM_LIST)
 
     def _cleanup_room_data(self, room: str) -> None:
         """Clean up all data for a room (consolidates duplicate cleanup logic)."""
@@ -1150,9 +1549,7 @@ class RRCTextualApp(App):
         self, message: str, room: str | None = None
     ) -> None:
         """Parse room info updates from hub notices."""
-        import re
-
-        match = re.match(r"room (\S+):[^;]*;\s*mode=([^;]+);\s*topic=(.+)", message)
+        match = _RE_ROOM_FULL.match(message)
         if match:
             room_name = normalize_room_name(match.group(1))
             mode = match.group(2).strip()
@@ -1165,7 +1562,7 @@ class RRCTextualApp(App):
             self._update_room_info()
             return
 
-        match = re.match(r"mode for (\S+) is now:\s*(.+)", message)
+        match = _RE_MODE.match(message)
         if match:
             room_name = normalize_room_name(match.group(1))
             modes = match.group(2).strip()
@@ -1176,7 +1573,7 @@ class RRCTextualApp(App):
             self._update_room_info()
             return
 
-        match = re.match(r"topic for (\S+) is now:\s*(.+)", message)
+        match = _RE_TOPIC.match(message)
         if match:
             room_name = normalize_room_name(match.group(1))
             topic = match.group(2).strip()
@@ -1238,11 +1635,12 @@ class RRCTextualApp(App):
                 formatted = self.message_formatter.format_command(text)
                 self._add_message(self.active_room, "command", formatted)
             else:
-                nick = self.config.get("nickname") or format_identity_hash(
-                    self.own_identity_hash or ""
+                formatted = self.message_formatter.format_user_message(
+                    self._own_nick, text
                 )
-                formatted = self.message_formatter.format_user_message(nick, text)
                 self._add_message(self.active_room, "own_msg_pending", formatted)
+                room_state = self.rooms[self.active_room]
+                room_state.pending_positions[msg_id] = room_state.appended - 1
 
                 self.pending_tracker.add(msg_id, self.active_room, text)
 
@@ -1253,48 +1651,58 @@ class RRCTextualApp(App):
 
     def _handle_slash_command(self, text: str) -> bool:
         """Handle slash commands. Returns True if handled client-side."""
-        parts = text.split(maxsplit=1)
-        cmd = parts[0].lower()
-        arg = parts[1] if len(parts) > 1 else ""
-
-        if cmd in ["/help", "/h", "/?"]:
-            self._show_help_message()
-            return True
-
-        elif cmd == "/nick":
-            if not arg:
-                self._show_error("Usage: /nick <nickname>")
-                return True
-            new_nick = sanitize_display_name(arg)
-            self.config["nickname"] = new_nick
-            if self.client:
-                self.client.nickname = new_nick
-            self._show_system(f"Nickname changed to: {new_nick}")
-            return True
-
-        elif cmd == "/join":
-            if not arg:
-                self._show_error("Usage: /join <room>")
-                return True
-            self._join_room_by_name(normalize_room_name(arg))
-            return True
-
-        elif cmd in ["/part", "/leave"]:
-            room = normalize_room_name(arg) if arg else self.active_room
-            self._part_room_by_name(room)
-            return True
-
-        elif cmd == "/clear":
-            if self.active_room in self.rooms:
-                self.rooms[self.active_room].messages = []
-                self._update_message_display()
-            return True
-
-        elif cmd in ["/quit", "/exit"]:
-            self.exit()
-            return True
-
-        return False
+        cmd, _, arg = text.partition(" ")
+        handler = self._SLASH_COMMANDS.get(cmd.lower())
+        if handler is None:
+            return False
+        handler(self, arg.strip())
+        return True
+
+    def _cmd_help(self, arg: str) -> None:
+        self._show_help_message()
+
+    def _cmd_nick(self, arg: str) -> None:
+        if not arg:
+            self._show_error("Usage: /nick <nickname>")
+            return
+        new_nick = sanitize_display_name(arg)
+        self.config["nickname"] = new_nick
+        self._refresh_own_nick()
+        if self.client:
+            self.client.nickname = new_nick
+        self._show_system(f"Nickname changed to: {new_nick}")
+
+    def _cmd_join(self, arg: str) -> None:
+        if not arg:
+            self._show_error("Usage: /join <room>")
+            return
+        self._join_room_by_name(normalize_room_name(arg))
+
+    def _cmd_part(self, arg: str) -> None:
+        room = normalize_room_name(arg) if arg else self.active_room
+        self._part_room_by_name(room)
+
+    def _cmd_clear(self, arg: str) -> None:
+        if self.active_room in self.rooms:
+            self.rooms[self.active_room].messages.clear()
+            self._update_message_display()
+
+    def _cmd_quit(self, arg: str) -> None:
+        self.exit()
+
+    # Commands handled client-side; anything else is sent to the hub.
+    _SLASH_COMMANDS: dict[str, Callable[[RRCTextualApp, str], None]] = {
+        "/help": _cmd_help,
+        "/h": _cmd_help,
+        "/?": _cmd_help,
+        "/nick": _cmd_nick,
+        "/join": _cmd_join,
+        "/part": _cmd_part,
+        "/leave": _cmd_part,
+        "/clear": _cmd_clear,
+        "/quit": _cmd_quit,
+        "/exit": _cmd_quit,
+    }
 
     def _show_help_message(self) -> None:
         """Show help information."""
@@ -1370,46 +1778,65 @@ class RRCTextualApp(App):
 
     def _handle_message_timeout(self, msg_id: bytes, room: str, text: str) -> None:
         """Handle a message timeout (called by PendingMessageTracker)."""
-        if room in self.rooms:
-            room_state = self.rooms[room]
-            nick = self.config.get("nickname", "You")
-            old_msg = self.message_formatter.format_user_message(nick, text)
+        # The buffer index is only stable on the UI thread, which appends.
+        self._safe_call_from_thread(self._mark_message_failed, msg_id, room, text)
+
+    def _mark_message_failed(self, msg_id: bytes, room: str, text: str) -> None:
+        """Restyle a timed-out own message. Must run on the UI thread."""
+        room_state = self.rooms.get(room)
+        if room_state is None:
+            return
+
+        i = room_state.pop_pending_index(msg_id)
+        if i is not None and room_state.messages[i][0] == "own_msg_pending":
+            old_msg = self.message_formatter.format_user_message(self._own_nick, text)
             new_msg = f"{old_msg} [TIMEOUT - message may not have been received]"
+            room_state.messages[i] = ("own_msg_failed", new_msg)
+
+        if room == self.active_room:
+            self._update_message_display()
 
-            for i, (style, msg) in enumerate(room_state.messages):
-                if style == "own_msg_pending" and text in msg:
-                    room_state.messages[i] = ("own_msg_failed", new_msg)
-                    break
+    def _mark_message_confirmed(self, msg_id: bytes, room: str) -> None:
+        """Restyle a confirmed own message. Must run on the UI thread."""
+        room_state = self.rooms.get(room)
+        if room_state is None:
+            return
 
-            if room == self.active_room:
-                self.call_from_thread(self._update_message_display)
+        i = room_state.pop_pending_index(msg_id)
+        if i is not None:
+            style, stored_msg = room_state.messages[i]
+            if style == "own_msg_pending":
+                room_state.messages[i] = ("own_msg_confirmed", stored_msg)
+
+        if room == self.active_room:
+            self._update_message_display()
+
+    def _refresh_own_nick(self) -> None:
+        """Recompute the nick shown on our own messages."""
+        self._own_nick = self.config.get("nickname") or format_identity_hash(
+            self.own_identity_hash or ""
+        )
 
     def _handle_rrc_welcome(self, env: dict) -> None:
         """Handle WELCOME message."""
         body = env.get(K_BODY, {})
         self.hub_name = body.get(B_WELCOME_HUB, "Unknown Hub")
 
-        self._show_system(f"Connected to {self.hub_name}")
+        self._safe_call_from_thread(self._show_system, f"Connected to {self.hub_name}")
 
         if isinstance(body, dict) and B_WELCOME_LIMITS in body:
             limits = body[B_WELCOME_LIMITS]
             if isinstance(limits, dict):
-                limit_parts = []
-                if L_MAX_NICK_BYTES in limits:
-                    limit_parts.append(f"nick: {limits[L_MAX_NICK_BYTES]}B")
-                if L_MAX_ROOM_NAME_BYTES in limits:
-                    limit_parts.append(f"room: {limits[L_MAX_ROOM_NAME_BYTES]}B")
-                if L_MAX_MSG_BODY_BYTES in limits:
-                    limit_parts.append(f"msg: {limits[L_MAX_MSG_BODY_BYTES]}B")
-                if L_MAX_ROOMS_PER_SESSION in limits:
-                    limit_parts.append(f"rooms: {limits[L_MAX_ROOMS_PER_SESSION]}")
-                if L_RATE_LIMIT_MSGS_PER_MINUTE in limits:
-                    limit_parts.append(
-                        f"rate: {limits[L_RATE_LIMIT_MSGS_PER_MINUTE]}/min"
-                    )
+                limit_parts = [
+                    fmt.format(value)
+                    for key, fmt in _LIMIT_FIELDS
+                    if (value := limits.get(key)) is not None
+                ]
 
                 if limit_parts:
-                    self._show_system(f"Hub limits: {', '.join(limit_parts)}")
+                    self._safe_call_from_thread(
+                        self._show_system, f"Hub limits: {', '.join(limit_parts)}"
+                    )
 
         self.title = "RRC TUI"
 
@@ -1439,46 +1866,47 @@ class RRCTextualApp(App):
         nick = env.get(K_NICK)
         body = env.get(K_BODY, "")
         msg_id = env.get(K_ID)
+        src_hex: str | None
+        if isinstance(src, bytes):
+            src_hex = src.hex()
+        else:
+            src_hex = src if isinstance(src, str) else None
+        own_hex = self.own_identity_hash
+        rooms = self.rooms
+        nickname_map = self.nickname_map
 
-        if src and nick:
-            src_hex = src.hex() if isinstance(src, bytes) else src
-            old_nick = self.nickname_map.get(src_hex)
+        if src_hex and nick:
+            old_nick = nickname_map.get(src_hex)
             new_nick = sanitize_display_name(nick)
 
-            self.nickname_map[src_hex] = new_nick
-
-            if old_nick != new_nick and room in self.rooms:
-                if src_hex in self.rooms[room].users:
-                    self.call_from_thread(self._update_user_list)
+            nickname_map[src_hex] = new_nick
+
+            if old_nick != new_nick:
+                for room_state in rooms.values():
+                    if src_hex in room_state.users:
+                        room_state.user_rows = None
+                # Background rooms pick the new nick up on their next switch.
+                active_state = rooms.get(self.active_room)
+                if active_state is not None and src_hex in active_state.users:
+                    self._safe_call_from_thread(
+                        self._schedule_refresh, _REFRESH_USER_LIST
+                    )
 
-        src_hex = src.hex() if isinstance(src, bytes) else src
-        if src_hex == self.own_identity_hash and msg_id:
+        if src_hex == own_hex and msg_id:
             pending_data = self.pending_tracker.confirm(msg_id)
             if pending_data:
                 pending_room, pending_text, sent_time = pending_data
 
                 if pending_room == room and pending_text == body:
-                    if room in self.rooms:
-                        room_state = self.rooms[room]
-                        nick = self.config.get("nickname") or format_identity_hash(
-                            self.own_identity_hash or ""
-                        )
-                        old_msg = self.message_formatter.format_user_message(nick, body)
-
-                        for i, (style, msg) in enumerate(room_state.messages):
-                            if style == "own_msg_pending" and pending_text in msg:
-                                room_state.messages[i] = ("own_msg_confirmed", old_msg)
-                                break
-
-                        if self.active_room == room:
-                            self.call_from_thread(self._update_message_display)
-
+                    self._safe_call_from_thread(
+                        self._mark_message_confirmed, msg_id, room
+                    )
                     return
 
-        if src_hex and src_hex != self.own_identity_hash:
-            display_name = self.nickname_map.get(src_hex, format_identity_hash(src_hex))
+        if src_hex and src_hex != own_hex:
+            display_name = nickname_map.get(src_hex, format_identity_hash(src_hex))
             formatted = self.message_formatter.format_user_message(display_name, body)
-            self.call_from_thread(self._add_message, room, "default", formatted)
+            self._safe_call_from_thread(self._add_message, room, "default", formatted)
 
     def _handle_rrc_notice(self, env: dict) -> None:
         """Handle NOTICE message."""
@@ -1487,12 +1915,12 @@ class RRCTextualApp(App):
 
         self._parse_room_info_from_notice(body, room)
 
-        self.call_from_thread(self._show_notice, body, room)
+        self._safe_call_from_thread(self._show_notice, body, room)
 
     def _handle_rrc_error(self, env: dict) -> None:
         """Handle ERROR message."""
         body = env.get(K_BODY, "Unknown error")
-        self.call_from_thread(self._show_error, body)
+        self._safe_call_from_thread(self._show_error, body)
 
     def _handle_rrc_joined(self, room: str, env: dict) -> None:
         """Handle JOINED message."""
@@ -1515,27 +1943,33 @@ class RRCTextualApp(App):
             if len(users) > 0:
                 joining_hash = users[0]
                 if isinstance(joining_hash, bytes):
-                    joining_hash_hex = joining_hash.hex()
+                    joining_hash_hex = sys.intern(joining_hash.hex())
                     room_state.users.add(joining_hash_hex)
+                    room_state.user_rows = None
                     user_nick = self.nickname_map.get(
                         joining_hash_hex, format_identity_hash(joining_hash_hex)
                     )
-                    self.call_from_thread(
+                    self._safe_call_from_thread(
                         self._show_system, f"{user_nick} joined room: {room}", room
                     )
                     if self.active_room == room:
-                        self.call_from_thread(self._update_user_list)
+                        self._safe_call_from_thread(
+                            self._schedule_refresh, _REFRESH_USER_LIST
+                        )
         else:
             for user_hash in users:
                 if isinstance(user_hash, bytes):
-                    room_state.users.add(user_hash.hex())
+                    room_state.users.add(sys.intern(user_hash.hex()))
 
             if self.own_identity_hash:
                 room_state.users.add(self.own_identity_hash)
+            room_state.user_rows = None
 
-            self.call_from_thread(self._show_system, f"You joined room: {room}", room)
-            self.call_from_thread(self._update_room_list)
-            self.call_from_thread(self._switch_room, room)
+            self._safe_call_from_thread(
+                self._show_system, f"You joined room: {room}", room
+            )
+            self._safe_call_from_thread(self._schedule_refresh, _REFRESH_ROOM_LIST)
+            self._safe_call_from_thread(self._switch_room, room)
 
     def _handle_rrc_parted(self, room: str, env: dict) -> None:
         """Handle PARTED message."""
@@ -1550,7 +1984,7 @@ class RRCTextualApp(App):
                 parting_hash_hex = parting_hash.hex()
 
                 if parting_hash_hex == self.own_identity_hash:
-                    self.call_from_thread(
+                    self._safe_call_from_thread(
                         self._show_system,
                         f"You parted from room: {room}",
                         self.HUB_ROOM,
@@ -1561,21 +1995,25 @@ class RRCTextualApp(App):
 
                     self._cleanup_room_data(room)
 
-                    self.call_from_thread(self._update_room_list)
-                    self.call_from_thread(self._update_room_info)
-                    self.call_from_thread(self._update_user_list)
-                    self.call_from_thread(self._update_message_display)
+                    self._safe_call_from_thread(
+                        self._schedule_refresh,
+                        _REFRESH_ROOM_LIST | _REFRESH_ROOM_INFO | _REFRESH_USER_LIST,
+                    )
+                    self._safe_call_from_thread(self._update_message_display)
                 else:
                     user_nick = self.nickname_map.get(
                         parting_hash_hex, format_identity_hash(parting_hash_hex)
                     )
-                    self.call_from_thread(
+                    self._safe_call_from_thread(
                         self._show_system, f"{user_nick} parted from room: {room}", room
                     )
                     if room in self.rooms:
                         self.rooms[room].users.discard(parting_hash_hex)
+                        self.rooms[room].user_rows = None
                         if self.active_room == room:
-                            self.call_from_thread(self._update_user_list)
+                            self._safe_call_from_thread(
+                                self._schedule_refresh, _REFRESH_USER_LIST
+                            )
 
     def _handle_rrc_pong(self, env: dict) -> None:
         """Handle PONG response and calculate latency."""
@@ -1586,6 +2024,10 @@ class RRCTextualApp(App):
             self.client.latency_ms = latency
             self._safe_call_from_thread(self._update_latency, latency)
 
+    def _handle_rrc_link_status(self, active: bool) -> None:
+        """Handle link established/closed notifications."""
+        self._safe_call_from_thread(self._update_link_status, active)
+
     def _update_latency(self, latency: float) -> None:
         """Update the latency reactive property."""
         self.latency_ms = latency
@@ -1602,7 +2044,7 @@ class RRCTextualApp(App):
         self.nickname_map.clear()
         self.pending_tracker.clear()
         self.pending_tracker.stop_checker()
-        self.latency_ms = None
+        self._update_link_status(False)
 
         rooms_to_remove = [r for r in self.rooms.keys() if r != self.HUB_ROOM]
         for room in rooms_to_remove:
@@ -1671,7 +2113,8 @@ class RRCTextualApp(App):
 
         identity_path = self.config.get("identity_path", "~/.rrc-tui/identity")
         identity = load_or_create_identity(identity_path)
-        self.own_identity_hash = identity.hash.hex()
+        self.own_identity_hash = sys.intern(identity.hash.hex())
+        self._refresh_own_nick()
 
         self._show_system(f"Connecting to hub {hub_hash[:16]}...")
         self.title = "RRC TUI - Connecting..."
@@ -1691,6 +2134,7 @@ class RRCTextualApp(App):
                 self.client.on_parted = self._handle_rrc_parted
                 self.client.on_close = self._handle_rrc_close
                 self.client.on_pong = self._handle_rrc_pong
+                self.client.on_link_status = self._handle_rrc_link_status
 
                 timeout = self.config.get("connection_timeout_seconds", 30)
                 self.client.connect(hub_dest_hash, timeout_s=timeout)
@@ -1740,7 +2184,9 @@ class RRCTextualApp(App):
         self.exit()
 
 
-def run_textual_tui():
+def run_textual_tui(config: dict[str, Any] | None = None):
     """Entry point for running the Textual TUI."""
-    app = RRCTextualApp()
+    app = RRCTextualApp(config)
     app.run()
+    if app.hubs_dirty:
+        app._save_discovered_hubs()
@@ -2,16 +2,32 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
 import re
+from collections.abc import Iterable
 from pathlib import Path
 
 import RNS
 
 logger = logging.getLogger(__name__)
 
+# Identity locations searched by get_identity_path(), in order; the last
+# one is also where a new identity is created.
+_HOME = os.path.expanduser("~")
+_IDENTITY_SEARCH_PATH_STRS = (
+    "/etc/rrc-tui/identity",
+    os.path.join(_HOME, ".config", "rrc-tui", "identity"),
+    os.path.join(_HOME, ".rrc-tui", "identity"),
+)
 
+# str.translate() table deleting C0/C1 control characters and DEL.
+_CTRL_DELETE = dict.fromkeys([*range(0x00, 0x20), *range(0x7F, 0xA0)])
+_STRICT_RE = re.compile(r"[^a-zA-Z0-9 \-_.\'()]")
+
+
+@functools.lru_cache(maxsize=4)
 def get_identity_path(config_identity_path: str | None = None) -> Path:
     """Get the path to the identity file.
 
@@ -23,6 +39,26 @@ def get_identity_path(config_identity_path: str | None = None) -> Path:
     If config specifies identity_path, use that if it exists.
     Otherwise, use the first existing identity, or default to ~/.rrc-tui/identity.
 
+    The result is cached per config_identity_path for the life of the
+    process, like get_identity_path_str(); clear both caches together to
+    search again.
+
+    Args:
+        config_identity_path: Optional path from config
+
+    Returns:
+        Path to identity file
+    """
+    return Path(get_identity_path_str(config_identity_path))
+
+
+@functools.lru_cache(maxsize=4)
+def get_identity_path_str(config_identity_path: str | None = None) -> str:
+    """Get the path to the identity file as a str.
+
+    Same search as get_identity_path(), for callers that hand the path
+    straight to os-level file functions.
+
     Args:
         config_identity_path: Optional path from config
 
@@ -30,24 +66,20 @@ def get_identity_path(config_identity_path: str | None = None) -> Path:
         Path to identity file
     """
     if config_identity_path:
-        config_path = Path(os.path.expanduser(os.path.expandvars(config_identity_path)))
-        if config_path.exists():
-            logger.debug(f"Using identity path from config: {config_path}")
+        if "$" in config_identity_path or "%" in config_identity_path:
+            config_identity_path = os.path.expandvars(config_identity_path)
+        config_path = os.path.expanduser(config_identity_path)
+        if os.path.exists(config_path):
+            logger.debug("Using identity path from config: %s", config_path)
             return config_path
 
-    search_paths = [
-        Path("/etc/rrc-tui/identity"),
-        Path(os.path.expanduser("~/.config/rrc-tui/identity")),
-        Path(os.path.expanduser("~/.rrc-tui/identity")),
-    ]
-
-    for path in search_paths:
-        if path.exists():
-            logger.debug(f"Found existing identity at: {path}")
+    for path in _IDENTITY_SEARCH_PATH_STRS:
+        if os.path.exists(path):
+            logger.debug("Found existing identity at: %s", path)
             return path
 
-    default_path = Path(os.path.expanduser("~/.rrc-tui/identity"))
-    logger.debug(f"No existing identity found, using default: {default_path}")
+    default_path = _IDENTITY_SEARCH_PATH_STRS[-1]
+    logger.debug("No existing identity found, using default: %s", default_path)
     return default_path
 
 
@@ -60,38 +92,71 @@ def load_or_create_identity(identity_path: str) -> RNS.Identity:
     Returns:
         RNS.Identity instance
     """
-    path = get_identity_path(identity_path)
-    path.parent.mkdir(parents=True, exist_ok=True)
+    path = get_identity_path_str(identity_path)
 
-    if path.exists():
-        try:
-            identity = RNS.Identity.from_file(str(path))
-            logger.info(f"Loaded identity from {path}")
+    # Read the key directly rather than stat()ing first: a missing file is
+    # reported by the open itself.
+    try:
+        with open(path, "rb") as f:
+            prv_bytes = f.read()
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning("Failed to load identity from %s: %s", path, e)
+        logger.info("Creating new identity")
+    else:
+        identity = RNS.Identity(create_keys=False)
+        if identity.load_private_key(prv_bytes):
+            logger.info("Loaded identity from %s", path)
             return identity
-        except Exception as e:
-            logger.warning(f"Failed to load identity from {path}: {e}")
-            logger.info("Creating new identity")
+        logger.warning("Failed to load identity from %s: invalid key data", path)
+        logger.info("Creating new identity")
+
+    # Check the directory before generating keys, so an unwritable location
+    # is reported up front. A bare file name has no directory part, which
+    # means the current directory.
+    parent = os.path.dirname(os.path.abspath(path)) or "."
+    try:
+        os.makedirs(parent, exist_ok=True)
+    except OSError as e:
+        logger.error("Failed to create identity directory %s: %s", parent, e)
+    writable = os.access(parent, os.W_OK)
 
     identity = RNS.Identity()
+
+    if not writable:
+        logger.error(
+            "Cannot save identity: %s is not writable. Using a temporary "
+            "identity for this session; set identity_path to a writable "
+            "location to keep it.",
+            parent,
+        )
+        return identity
+
     try:
-        identity.to_file(str(path))
-        logger.info(f"Created and saved new identity to {path}")
+        identity.to_file(path)
+        logger.info("Created and saved new identity to %s", path)
     except Exception as e:
-        logger.error(f"Failed to save identity to {path}: {e}")
+        logger.error("Failed to save identity to %s: %s", path, e)
 
     return identity
 
 
+@functools.lru_cache(maxsize=512)
 def normalize_room_name(room: str) -> str:
     """Normalize room name to lowercase.
 
+    Results are memoized; hubs use a small set of distinct room names.
+    This must stay in step with Client._canonical_room(), so it uses
+    str.lower() rather than str.casefold().
+
     Args:
         room: Room name
 
     Returns:
         Normalized room name
     """
-    return room.lower().strip()
+    return room.strip().lower()
 
 
 def sanitize_display_name(name: str, max_length: int = 50, strict: bool = False) -> str:
@@ -108,11 +173,27 @@ def sanitize_display_name(name: str, max_length: int = 50, strict: bool = False)
     if not name:
         return ""
 
-    name = re.sub(r"[\x00-\x1f\x7f-\x9f]", "", name)
-    name = " ".join(name.split())
-
+    # Printable ASCII cannot contain any of the control characters, and its
+    # only whitespace is the plain space, so a short name without stray
+    # spaces (and, if strict, without disallowed characters) is returned
+    # unchanged.
+    if name.isascii() and name.isprintable():
+        if (
+            len(name) <= max_length
+            and "  " not in name
+            and name[0] != " "
+            and name[-1] != " "
+            and not (strict and _STRICT_RE.search(name))
+        ):
+            return name
+    else:
+        name = name.translate(_CTRL_DELETE)
     if strict:
-        name = re.sub(r"[^a-zA-Z0-9 \-_.\'()]", "", name)
+        # Filter word by word so whitespace is collapsed in a single pass;
+        # words left empty by the filter are dropped.
+        words = (_STRICT_RE.sub("", word) for word in name.split())
+        name = " ".join(word for word in words if word)
+    else:
         name = " ".join(name.split())
 
     if len(name) > max_length:
@@ -124,6 +205,9 @@ def sanitize_display_name(name: str, max_length: int = 50, strict: bool = False)
 def format_identity_hash(identity_hash: bytes | str) -> str:
     """Format identity hash for display.
 
+    Results are memoized on the hex form, since the same identities are
+    formatted on every user list and message render.
+
     Args:
         identity_hash: Identity hash as bytes or hex string
 
@@ -131,13 +215,42 @@ def format_identity_hash(identity_hash: bytes | str) -> str:
         Formatted hash string
     """
     if isinstance(identity_hash, bytes):
+        if len(identity_hash) == 16:
+            return format_rns_identity_hash(identity_hash)
         identity_hash = identity_hash.hex()
+    return _format_identity_hex(identity_hash)
+
+
+def format_rns_identity_hash(identity_hash: bytes) -> str:
+    """Format a 16-byte RNS identity hash for display.
+
+    Only the bytes that are actually shown get hex-encoded. The caller must
+    guarantee a 16-byte hash; use format_identity_hash() for anything else.
 
+    Args:
+        identity_hash: 16-byte identity hash
+
+    Returns:
+        Formatted hash string, identical to format_identity_hash()
+    """
+    return f"{identity_hash[:4].hex()}...{identity_hash[-4:].hex()}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_identity_hex(identity_hash: str) -> str:
     if len(identity_hash) > 16:
         return f"{identity_hash[:8]}...{identity_hash[-8:]}"
     return identity_hash
 
 
+def _clean_hash_text(text: str) -> str:
+    """Lowercase hash input and drop surrounding whitespace and any 0x prefix."""
+    s = str(text).strip().lower()
+    if s.startswith("0x"):
+        s = s[2:]
+    return s
+
+
 def parse_hash(text: str) -> bytes:
     """Parse hash from text input.
 
@@ -150,10 +263,12 @@ def parse_hash(text: str) -> bytes:
     Raises:
         ValueError: If hash is invalid
     """
-    s = str(text).strip().lower()
-    if s.startswith("0x"):
-        s = s[2:]
-    s = "".join(ch for ch in s if not ch.isspace())
+    s = _clean_hash_text(text)
+    if len(s) != 32:
+        # A clean 32-digit hash, the usual case, is decoded as is. Anything
+        # else may be a hash pasted with whitespace, even inside byte pairs
+        # where bytes.fromhex() does not skip it, so strip it all first.
+        s = "".join(s.split())
     try:
         b = bytes.fromhex(s)
     except Exception as e:
@@ -161,3 +276,37 @@ def parse_hash(text: str) -> bytes:
     if len(b) != 16:
         raise ValueError(f"destination hash must be 16 bytes (got {len(b)})")
     return b
+
+
+def parse_hashes(texts: Iterable[str]) -> list[bytes]:
+    """Parse several hashes from text input.
+
+    Clean 32-digit hex inputs are decoded together with a single
+    bytes.fromhex() call; anything else falls back to parse_hash() per
+    item, which also pinpoints the invalid entry.
+
+    Args:
+        texts: Hashes as hex strings
+
+    Returns:
+        Hashes as bytes, in input order
+
+    Raises:
+        ValueError: If any hash is invalid
+    """
+    texts = list(texts)
+    cleaned = []
+    for text in texts:
+        s = _clean_hash_text(text)
+        if len(s) != 32 or not s.isalnum():
+            break
+        cleaned.append(s)
+    else:
+        try:
+            data = bytes.fromhex("".join(cleaned))
+        except ValueError:
+            pass
+        else:
+            return [data[i : i + 16] for i in range(0, len(data), 16)]
+
+    return [parse_hash(text) for text in texts]